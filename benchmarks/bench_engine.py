@@ -0,0 +1,250 @@
+"""
+Benchmarks du moteur (sans interface graphique).
+
+Mesure, pour chaque civilisation de test (utils.py des deux paquets) :
+- steps_per_second : appels à step() par seconde ;
+- ant_moves_per_second : déplacements de fourmis (changement de ville) par
+  seconde de step() ;
+- iterations_per_second : appels à iteration() par seconde (TSP seulement) ;
+- generations_per_second : générations complètes de l'algorithme génétique
+  (genetic_algo, réinitialisation, run_generation) par seconde ;
+- peak_memory_kib : pic mémoire Python (tracemalloc) pendant les steps.
+
+Chaque cas est lancé avec la même graine, la colonie de la civilisation de
+test étant remplacée par --ants fourmis (--alpha, --beta). Les résultats sont
+écrits en JSON (par défaut benchmarks/bench_results.json) et peuvent être
+comparés à un fichier précédent :
+
+    python benchmarks/bench_engine.py --output avant.json
+    python benchmarks/bench_engine.py --output apres.json --compare avant.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARKS_DIR.parent / "src"))
+
+import pcc.utils as pcc_utils  # noqa: E402
+import tsp.utils as tsp_utils  # noqa: E402
+
+# Métriques pour lesquelles une valeur plus grande est meilleure
+HIGHER_IS_BETTER = {
+    "steps_per_second": True,
+    "ant_moves_per_second": True,
+    "iterations_per_second": True,
+    "generations_per_second": True,
+    "peak_memory_kib": False,
+}
+
+
+def get_cases(sizes, backends):
+    """Cas de benchmark : nom -> fonction construisant la civilisation."""
+    cases = {
+        "tsp_small": tsp_utils.get_small_civ_tsp,
+        "tsp_big": tsp_utils.get_big_civ_tsp,
+        "tsp_really_big": tsp_utils.get_really_big_civ_tsp,
+        "pcc_small": pcc_utils.get_small_civ_pcc,
+        "pcc_big": pcc_utils.get_big_civ_pcc,
+        "pcc_really_big": pcc_utils.get_really_big_civ_pcc,
+    }
+    for backend in backends:
+        for n in sizes:
+            cases[f"tsp_full_{n}_{backend}"] = (
+                lambda n=n, backend=backend: tsp_utils.create_full_city_tsp(n, backend)
+            )
+    return cases
+
+
+def seed_all(seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def build(factory, seed: int, ants: int, alpha: float, beta: float):
+    seed_all(seed)
+    civ = factory()
+    # Les civilisations de test ont déjà leur colonie : on la remplace
+    civ.reset_ants()
+    civ.create_ant_colony(ants, alpha, beta)
+    return civ
+
+
+def measure_steps(civ, steps: int):
+    """Durée cumulée de steps appels à step() et nombre de déplacements."""
+    elapsed = 0.0
+    moves = 0
+    for _ in range(steps):
+        before = [ant.get_current_city() for ant in civ.get_ants()]
+        start = time.perf_counter()
+        civ.step()
+        elapsed += time.perf_counter() - start
+        moves += sum(
+            ant.get_current_city() is not city
+            for ant, city in zip(civ.get_ants(), before)
+        )
+    return elapsed, moves
+
+
+def measure_iterations(civ, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        civ.iteration()
+    return time.perf_counter() - start
+
+
+def measure_generations(civ, generations: int):
+    # Même boucle que genetic_algo_application
+    civ.run_generation()
+    start = time.perf_counter()
+    for _ in range(generations):
+        civ.genetic_algo()
+        civ.reset_pheromones()
+        for ant in civ.get_ants():
+            ant.reset_ant()
+        civ.run_generation()
+    return time.perf_counter() - start
+
+
+def measure_peak_memory(civ, steps: int):
+    tracemalloc.start()
+    try:
+        for _ in range(steps):
+            civ.step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def run_case(factory, args):
+    """
+    Lance chaque mesure sur une civilisation neuve, avec la même graine.
+    Une mesure qui échoue est notée dans "errors" sans arrêter les autres.
+    """
+    civ = build(factory, args.seed, args.ants, args.alpha, args.beta)
+    result = {
+        "cities": len(civ.get_cities()),
+        "roads": len(civ.get_roads()),
+        "ants": len(civ.get_ants()),
+    }
+    errors = {}
+
+    def fresh():
+        return build(factory, args.seed, args.ants, args.alpha, args.beta)
+
+    try:
+        elapsed, moves = measure_steps(fresh(), args.steps)
+        result["steps_per_second"] = args.steps / elapsed
+        result["ant_moves_per_second"] = moves / elapsed
+    except Exception as error:
+        errors["steps"] = repr(error)
+    if hasattr(civ, "iteration"):
+        try:
+            elapsed = measure_iterations(fresh(), args.iterations)
+            result["iterations_per_second"] = args.iterations / elapsed
+        except Exception as error:
+            errors["iterations"] = repr(error)
+    try:
+        elapsed = measure_generations(fresh(), args.generations)
+        result["generations_per_second"] = args.generations / elapsed
+    except Exception as error:
+        errors["generations"] = repr(error)
+    try:
+        result["peak_memory_kib"] = measure_peak_memory(fresh(), args.memory_steps)
+    except Exception as error:
+        errors["memory"] = repr(error)
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def compare(results, baseline):
+    """Affiche le rapport nouveau / ancien pour chaque métrique commune."""
+    print(f"\n{'cas':<28}{'métrique':<26}{'avant':>12}{'après':>12}{'ratio':>9}")
+    for case, metrics in results.items():
+        old_metrics = baseline.get(case, {})
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            if metric not in metrics or metric not in old_metrics:
+                continue
+            old, new = old_metrics[metric], metrics[metric]
+            ratio = new / old if old else float("inf")
+            better = ratio >= 1 if higher_is_better else ratio <= 1
+            flag = "" if abs(ratio - 1) < 0.05 else (" +" if better else " -")
+            print(f"{case:<28}{metric:<26}{old:>12.1f}{new:>12.1f}{ratio:>8.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=str(BENCHMARKS_DIR / "bench_results.json"))
+    parser.add_argument("--compare", help="fichier JSON d'un run précédent")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ants", type=int, default=10)
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--beta", type=float, default=2.0)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--generations", type=int, default=3)
+    parser.add_argument("--memory-steps", type=int, default=100)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100])
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["objects", "matrix"],
+        choices=["objects", "matrix"],
+    )
+    parser.add_argument("--only", nargs="+", help="noms des cas à lancer")
+    args = parser.parse_args()
+
+    cases = get_cases(args.sizes, args.backends)
+    if args.only:
+        cases = {name: cases[name] for name in args.only}
+
+    results = {}
+    for name, factory in cases.items():
+        results[name] = run_case(factory, args)
+        summary = ", ".join(
+            f"{metric}={results[name][metric]:.1f}"
+            for metric in HIGHER_IS_BETTER
+            if metric in results[name]
+        )
+        if "errors" in results[name]:
+            summary += f" (échecs : {', '.join(results[name]['errors'])})"
+        print(f"{name}: {summary}", flush=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "parameters": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare")
+            },
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nRésultats écrits dans {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline["meta"]["parameters"] != report["meta"]["parameters"]:
+            print("Attention : paramètres différents de ceux du run de référence")
+        compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
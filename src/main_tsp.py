@@ -1,24 +1,16 @@
 from tsp.utils import *
-
-
-def main(civ, edition_mode):
-    app = QApplication(sys.argv)
-    window = Visualizer(civ, edition_mode)
-    window.showMaximized()
-
-    sys.exit(app.exec_())
-
+from tsp.visualizer import main_tsp
 
 if __name__ == "__main__":
     ###########################
     # TSP AVEC UNE VILLE FIXE #
     ###########################
     # civ = create_full_city_tsp(5)
-    # main(civ, edition_mode=False)
+    # main_tsp(civ, edition_mode=False)
 
     ####################################
     # TSP AVEC UNE VILLE PERSONNALISÉE #
     ####################################
     civ = get_empty_civ_tsp()
     civ.create_ant_colony(5, 0.5, 0.5)
-    main(civ, edition_mode=True)
+    main_tsp(civ, edition_mode=True)
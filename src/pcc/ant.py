@@ -1,6 +1,9 @@
 import random
 
-from PyQt5.QtGui import QColor
+
+def extend_signature(signature: int, road_id) -> int:
+    """Hachage glissant d'un chemin : signature du préfixe prolongé d'une route."""
+    return hash((signature, road_id))
 
 
 class Ant:
@@ -13,33 +16,17 @@ class Ant:
         self.__current_city = start_city
         self.__next_city = None
         self.__speed = 1.0
-        self.__color_no_food = QColor(100, random.randint(240, 255), 100)
-        self.__color_with_food = QColor(
-            random.randint(150, 230), random.randint(90, 120), 10
-        )
         self.__explored_roads = []
+        # Signatures des préfixes du chemin en cours (pile parallèle aux routes)
+        self.__path_signatures = [0]
         self.__cumulated_weights = 0
         self.__food_quantity = 0
-        self.__explored_roads_count = {}
+        self.__explored_roads_count = {}  # signature du chemin -> passages
         self.__q0 = 0.25
-        self.__color = None
 
     def get_id(self):
         return self.__id
 
-    def get_color(self):
-        if self.__has_food:
-            return self.__color_with_food
-        else:
-            return self.__color_no_food
-
-    def get_personalised_color(self):
-        return self.__color
-
-    def set_color(self, color):
-        self.__color_no_food = color
-        self.__color = color
-
     def get_speed(self):
         return self.__speed
 
@@ -50,6 +37,13 @@ class Ant:
     def get_parameters(self):
         return self.__alpha, self.__beta
 
+    def get_q0(self):
+        return self.__q0
+
+    def set_q0(self, q0: float):
+        assert 0 <= q0 <= 1
+        self.__q0 = q0
+
     def get_food_quantity(self):
         return self.__food_quantity
 
@@ -76,6 +70,7 @@ class Ant:
         self.__current_city = self.__start_city
         self.__next_city = None
         self.__explored_roads = []
+        self.__path_signatures = [0]
         self.__cumulated_weights = 0
         self.__food_quantity = 0
         self.__explored_roads_count = {}
@@ -90,6 +85,9 @@ class Ant:
 
     def add_explored_road(self, road):
         self.__explored_roads.append(road)
+        self.__path_signatures.append(
+            extend_signature(self.__path_signatures[-1], road.get_id())
+        )
         return
 
     def get_explored_roads(self):
@@ -102,8 +100,19 @@ class Ant:
         self.__explored_roads_count[road] = 0
 
     def pop_explored_roads(self):
-        self.__explored_roads.pop()
-        return
+        self.__path_signatures.pop()
+        return self.__explored_roads.pop()
+
+    def get_path_signature(self):
+        return self.__path_signatures[-1]
+
+    def register_explored_path(self, signature=None):
+        """Comptabilise le chemin en cours (ou la signature donnée) en O(1)."""
+        if signature is None:
+            signature = self.__path_signatures[-1]
+        self.__explored_roads_count[signature] = (
+            self.__explored_roads_count.get(signature, 0) + 1
+        )
 
     def has_food(self):
         return self.__has_food
@@ -118,6 +127,11 @@ class Ant:
     def set_food_quatity(self):
         self.__food_quantity += 1
 
+    def load_fitness(self, food_quantity: int, explored_roads_count: dict):
+        """Reprend une fitness évaluée ailleurs (par exemple dans un processus)."""
+        self.__food_quantity = food_quantity
+        self.__explored_roads_count = dict(explored_roads_count)
+
     def take_food(self):
         pass
 
@@ -132,7 +146,20 @@ class Ant:
         road.add_pheromone(self.compute_pheromone())
         return
 
-    def weighted_choice(self, roads):
+    def weighted_choice(self, roads, table=None):
+        """
+        Choisit la prochaine route. Si une TransitionTable de la ville courante
+        est fournie, le tirage se fait sans recalculer les poids, en O(log d)
+        (recherche dichotomique dans les poids cumulés des d routes).
+        """
+        if table is not None:
+            q = random.uniform(0, 1)
+            if table.is_empty():
+                return random.choice(roads)
+            if q <= self.__q0:
+                return table.get_best_road()
+            return table.sample()
+
         # Récupère les poids en utilisant alpha et beta
         weights = [
             (road.get_pheromone() ** self.__alpha)
@@ -140,9 +167,8 @@ class Ant:
             for road in roads
         ]
         total_weights = sum(weights)
-        probabilities = [w / total_weights for w in weights]
         q = random.uniform(0, 1)
-        if sum(weights) == 0:
+        if total_weights == 0:
             return random.choice(roads)
         if q <= self.__q0:
             # Exploitation : sélection de la route avec le poids maximal
@@ -153,7 +179,7 @@ class Ant:
             )
         else:
             # Exploration : sélection d'une route selon les probabilités
-            return random.choices(roads, weights=probabilities, k=1)[0]
+            return random.choices(roads, weights=weights, k=1)[0]
 
     def mutation(self):
         parameter_to_mutate = random.choice(["alpha", "beta"])
@@ -3,6 +3,9 @@ class City:
         self.__id = id
         self.__outgoing_roads = []
         self.__position = position
+        # Incrémentée à chaque modification non uniforme des phéromones des
+        # routes sortantes (sert à invalider les tables de transition)
+        self.__pheromone_version = 0
 
     def get_id(self):
         return self.__id
@@ -19,8 +22,15 @@ class City:
 
     def add_road(self, road):
         self.__outgoing_roads.append(road)
+        self.__pheromone_version += 1
         return
 
+    def get_pheromone_version(self):
+        return self.__pheromone_version
+
+    def bump_pheromone_version(self):
+        self.__pheromone_version += 1
+
     def get_neighbors(self):
         return [road.get_cities()[1] for road in self.__outgoing_roads]
 
@@ -6,7 +6,12 @@ from sklearn.manifold import MDS
 
 from pcc.ant import Ant
 from pcc.city import City
+from pcc.convergence import ConvergenceMonitor
+from pcc.evaporation import EvaporationClock
+from pcc.pheromone_ranking import PheromoneRanking
+from pcc.profiling import PhaseProfiler
 from pcc.road import Road
+from pcc.transition_cache import TransitionCache
 
 
 class Civilization:
@@ -21,26 +26,49 @@ class Civilization:
     ):
         self.__cities = [nest, food_source]
         self.__roads = []
+        # Index maintenus par add_city / add_road pour des recherches en O(1)
+        self.__cities_by_id = {nest.get_id(): nest, food_source.get_id(): food_source}
+        self.__roads_by_cities = {}
+        self.__transition_cache = TransitionCache()
+        # Ant Colony System, voir set_acs : (q0, xi, tau0) ou None
+        self.__acs = None
+        self.__ant_q0 = 0.25  # q0 donné aux nouvelles fourmis
+        # Meilleur chemin nid -> nourriture trouvé et meilleur chemin du
+        # dernier step où une fourmi a trouvé la nourriture (routes)
+        self.__best_path = None
+        self.__best_length = np.inf
+        self.__best_path_cities = None
+        self.__iteration_best_path = None
+        self.__iteration_best_length = np.inf
+        self.__iteration_best_path_cities = None
+        # Chemin glouton de get_best_path, recalculé quand un classement change
+        self.__ranking = PheromoneRanking()
+        self.__best_path_cache = None
+        self.__best_path_version = None
         self.__nest = nest
         self.__food_source = food_source
         self.__ants = []
         self.__half_pheromone_time = int(np.log(1 / 2) / np.log(1 - evaporation_rate))
         self.__evaporation_rate = evaporation_rate
+        # Évaporation paresseuse, appliquée par chaque route à son prochain accès
+        self.__evaporation_clock = EvaporationClock(evaporation_rate)
         self.steps = 0
         self.__initial_pheromone = initial_pheromone
         self.__scale_factor = 120  # 1 unité de poids correspond à 120 pixels
         self.__mutation_factor = mutation_factor
         self.__threshold_genetic_algo = 150
         self.__steps_genetic_algo = steps_genetic_algo
+        self.__convergence_monitor = None  # arrêt anticipé des générations
+        self.__profiler = None  # voir set_profiler
 
     def get_cities(self):
         return self.__cities
 
     def get_city_by_id(self, id: int):
-        for city in self.__cities:
-            if city.get_id() == id:
-                return city
-        return None
+        return self.__cities_by_id.get(id)
+
+    def get_road_by_cities(self, start_city, end_city):
+        return self.__roads_by_cities.get((start_city.get_id(), end_city.get_id()))
 
     def get_roads(self):
         return self.__roads
@@ -63,8 +91,16 @@ class Civilization:
     def get_mutation_factor(self):
         return self.__mutation_factor
 
+    def get_evaporation_rate(self):
+        return self.__evaporation_rate
+
+    def get_steps_genetic_algo(self):
+        return self.__steps_genetic_algo
+
     def add_city(self, city: City):
         self.__cities.append(city)
+        self.__cities_by_id[city.get_id()] = city
+        self.__best_path_cache = None
         return
 
     def get_threshold_genetic_algo(self):
@@ -79,10 +115,19 @@ class Civilization:
         start_city: City,
         end_city: City,
     ):
-        road = Road(weight, start_city, end_city, self.__initial_pheromone)
+        road = Road(
+            weight,
+            start_city,
+            end_city,
+            self.__initial_pheromone,
+            self.__evaporation_clock,
+        )
+        road.set_listener(self.__ranking.road_changed)
         self.__roads.append(road)
+        self.__roads_by_cities[road.get_id()] = road
         start_city = self.get_city_by_id(road.get_cities()[0].get_id())
         start_city.add_road(road)
+        self.__ranking.forget(start_city)
         return
 
     def add_ants(self, ant: Ant):
@@ -91,6 +136,7 @@ class Civilization:
 
     def set_nest(self, nest: City):
         self.__nest = nest
+        self.__best_path_cache = None
         return
 
     def set_food_source(self, food_source: City):
@@ -101,14 +147,89 @@ class Civilization:
         self.__initial_pheromone = new_initial_pheronome
 
     def halve_pheromone(self):
+        # Uniforme comme l'évaporation : les tables de transition restent valides
+        self.__evaporation_clock.scale(1 / 2)
+
+    def reset_pheromones(self, value: float = None):
+        if value is None:
+            # En ACS, les routes repartent de tau0
+            value = self.__initial_pheromone if self.__acs is None else self.__acs[2]
         for road in self.__roads:
-            current_pheromone = road.get_pheromone()
-            road.set_pheromone(current_pheromone / 2)
+            road.reset_pheromone(value)
+        self.__transition_cache.clear()
+
+    def set_acs(
+        self, enabled: bool, q0: float = 0.9, xi: float = 0.1, tau0: float = None
+    ):
+        """
+        Active l'Ant Colony System : les fourmis exploitent avec probabilité
+        q0, chaque route empruntée est rapprochée de tau0
+        (tau <- (1 - xi) tau + xi tau0) et seul le meilleur chemin trouvé
+        est renforcé (tau <- (1 - rho) tau + rho / L²), sans évaporation
+        globale ni dépôt au retour. Par défaut tau0 = 1 / (n L_nn²), L_nn
+        étant la longueur du chemin glouton vers la nourriture, et toutes les
+        routes partent de tau0. Désactivé, les fourmis reprennent q0 = 0.25.
+        """
+        assert 0 <= q0 <= 1 and 0 < xi < 1
+        self.__acs = None
+        if enabled:
+            if tau0 is None:
+                length = self.__nearest_neighbour_length()
+                tau0 = 1 / (len(self.__cities) * length * length)
+            self.__acs = (q0, xi, tau0)
+            self.reset_pheromones(tau0)
+        self.__ant_q0 = q0 if enabled else 0.25
+        for ant in self.__ants:
+            ant.set_q0(self.__ant_q0)
+
+    def get_acs(self):
+        """(q0, xi, tau0) si l'ACS est actif, None sinon."""
+        return self.__acs
+
+    def __nearest_neighbour_length(self):
+        # Chemin glouton vers la nourriture ; somme des poids s'il bloque
+        current_city = self.__nest
+        visited = {current_city}
+        length = 0
+        while current_city != self.__food_source:
+            roads = [
+                road
+                for road in current_city.get_roads()
+                if road.get_cities()[1] not in visited
+            ]
+            if not roads:
+                return sum(road.get_weight() for road in self.__roads)
+            road = min(roads, key=lambda road: road.get_weight())
+            length += road.get_weight()
+            current_city = road.get_cities()[1]
+            visited.add(current_city)
+        return length
+
+    def __acs_local_update(self, road):
+        if self.__acs is None:
+            return
+        _, xi, tau0 = self.__acs
+        road.set_pheromone((1 - xi) * road.get_pheromone() + xi * tau0)
+
+    def __acs_global_update(self):
+        if self.__best_path is None:
+            return
+        rho = self.__evaporation_rate
+        amount = 1 / (self.__best_length * self.__best_length)
+        for road in self.__best_path:
+            road.set_pheromone((1 - rho) * road.get_pheromone() + rho * amount)
+
+    def choose_road(self, ant, roads):
+        """Tire la prochaine route de la fourmi via les tables de transition."""
+        alpha, beta = ant.get_parameters()
+        table = self.__transition_cache.get(ant.get_current_city(), alpha, beta)
+        return ant.weighted_choice(roads, table)
 
     def create_ant_colony(self, ant_number: int, alpha: float, beta: float):
         assert ant_number > 0
         for i in range(ant_number):
             ant = Ant(len(self.get_ants()), alpha, beta, self.__nest)
+            ant.set_q0(self.__ant_q0)
             self.add_ants(ant)
         return
 
@@ -154,9 +275,7 @@ class Civilization:
         ]
 
     def find_reversed_road(self, reversed_road):
-        for road in self.__roads:
-            if road.get_id() == reversed_road.get_id()[::-1]:
-                return road
+        return self.__roads_by_cities.get(reversed_road.get_id()[::-1])
 
     def migration(self):
         alpha = random.uniform(0, 5)
@@ -209,15 +328,33 @@ class Civilization:
             ant.mutation()
         self.migration()
 
+    def set_profiler(self, profiler: PhaseProfiler):
+        """
+        Installe un PhaseProfiler (None pour le retirer) qui chronomètre les
+        phases de step() et de la boucle génétique.
+        """
+        self.__profiler = profiler
+
+    def get_profiler(self):
+        return self.__profiler
+
     def step(self):
+        profiler = self.__profiler
+        if profiler is not None:
+            start = profiler.clock()
         self.steps += 1
 
-        if self.steps == self.__half_pheromone_time:
-            self.halve_pheromone()
-        # Évaporation des phéromones
-        for road in self.__roads:
-            road.evaporate_pheromone()
-
+        # Évaporation des phéromones (en ACS, seulement sur le meilleur chemin)
+        if self.__acs is None:
+            if self.steps == self.__half_pheromone_time:
+                self.halve_pheromone()
+            if profiler is not None:
+                start = profiler.lap("halve_check", start)
+            self.__evaporation_clock.tick()
+        if profiler is not None:
+            start = profiler.lap("evaporation", start)
+
+        step_best = None  # (longueur, routes) du meilleur chemin de ce step
         for ant in self.__ants:
             # RECHERCHE DE NOURRITURE
             if not ant.has_food():
@@ -225,42 +362,31 @@ class Civilization:
                 if ant.get_current_city().get_id() == self.get_food_source().get_id():
                     ant.set_has_food(True)
                     ant.set_food_quatity()
-                    ant.set_cumulated_weights(
-                        sum([road.get_weight() for road in ant.get_explored_roads()])
+                    length = sum(
+                        [road.get_weight() for road in ant.get_explored_roads()]
                     )
+                    ant.set_cumulated_weights(length)
+                    if ant.get_explored_roads() and (
+                        step_best is None or length < step_best[0]
+                    ):
+                        step_best = (length, list(ant.get_explored_roads()))
 
                     # Commencer immédiatement le chemin de retour
                     if ant.get_explored_roads():
-                        new_road = tuple(
-                            [road.get_id() for road in ant.get_explored_roads()]
-                        )
-
-                        def compare_keys(tuple1, tuple2):
-                            for i in range(len(tuple1)):
-                                if (
-                                    tuple1[i][0] != tuple2[i][0]
-                                    or tuple1[i][1] != tuple2[i][1]
-                                ):
-                                    return False
-                            return True
-
-                        if any(
-                            compare_keys(new_road, key)
-                            for key in ant.get_explored_roads_count().keys()
-                        ):
-                            ant.increment_explored_roads(new_road)
-                        else:
-                            ant.add_explored_roads_count(new_road)
-                            ant.increment_explored_roads(new_road)
+                        ant.register_explored_path()
                         next_road = ant.get_explored_roads()[-1].reverse()
                         next_city = next_road.get_cities()[1]
                         ant.set_next_city(next_city)
+                    if profiler is not None:
+                        start = profiler.lap("arrival", start)
                     continue
 
                 # Si la fourmi a une destination, elle s'y déplace
                 if ant.get_next_city() is not None:
                     ant.set_current_city(ant.get_next_city())
                     ant.set_next_city(None)  # Réinitialiser pour le prochain choix
+                if profiler is not None:
+                    start = profiler.lap("move", start)
 
                 # Choisir la prochaine ville à visiter
                 outgoing_roads = ant.get_current_city().get_roads()
@@ -271,10 +397,17 @@ class Civilization:
                 ):
                     continue
 
-                next_road = ant.weighted_choice(outgoing_roads)
+                next_road = self.choose_road(ant, outgoing_roads)
+                if profiler is not None:
+                    start = profiler.lap("choice", start)
+                    profiler.count("choices")
+                    profiler.count("roads_scanned", len(outgoing_roads))
                 ant.add_explored_road(next_road)
+                self.__acs_local_update(next_road)
                 next_city = next_road.get_cities()[1]
                 ant.set_next_city(next_city)
+                if profiler is not None:
+                    start = profiler.lap("move", start)
 
             # RETOUR AU NID
             else:
@@ -282,14 +415,23 @@ class Civilization:
                 if ant.get_current_city().get_id() == self.get_nest().get_id():
                     ant.set_has_food(False)
                     ant.set_cumulated_weights(0)
+                    if profiler is not None:
+                        start = profiler.lap("arrival", start)
 
                     # Choisir immédiatement une nouvelle destination
                     outgoing_roads = ant.get_current_city().get_roads()
                     if outgoing_roads:
-                        next_road = ant.weighted_choice(outgoing_roads)
+                        next_road = self.choose_road(ant, outgoing_roads)
+                        if profiler is not None:
+                            start = profiler.lap("choice", start)
+                            profiler.count("choices")
+                            profiler.count("roads_scanned", len(outgoing_roads))
                         ant.add_explored_road(next_road)
+                        self.__acs_local_update(next_road)
                         next_city = next_road.get_cities()[1]
                         ant.set_next_city(next_city)
+                        if profiler is not None:
+                            start = profiler.lap("move", start)
                     continue
 
                 # Si la fourmi a une destination, elle s'y déplace
@@ -301,26 +443,67 @@ class Civilization:
                         last_road = ant.get_explored_roads()[-1]
                         reversed_road = last_road.reverse()
                         original_road = self.find_reversed_road(reversed_road)
-                        if original_road:
+                        if original_road and self.__acs is None:
                             ant.deposit_pheromone(original_road)
+                    if profiler is not None:
+                        start = profiler.lap("deposit", start)
 
                     ant.set_next_city(None)  # Réinitialiser pour le prochain choix
 
                 # Choisir la prochaine ville pour continuer le retour
                 if ant.get_explored_roads():
-                    last_road = (
-                        ant.get_explored_roads().pop()
-                    )  # Retirer la dernière route
+                    last_road = ant.pop_explored_roads()  # Retirer la dernière route
                     next_road = last_road.reverse()
                     next_city = next_road.get_cities()[1]
                     ant.set_next_city(next_city)
+                if profiler is not None:
+                    start = profiler.lap("move", start)
+
+        if step_best is not None:
+            self.__iteration_best_length, self.__iteration_best_path = step_best
+            self.__iteration_best_path_cities = [self.__nest] + [
+                road.get_cities()[1] for road in self.__iteration_best_path
+            ]
+            if self.__iteration_best_length < self.__best_length:
+                self.__best_length = self.__iteration_best_length
+                self.__best_path = self.__iteration_best_path
+                self.__best_path_cities = self.__iteration_best_path_cities
+            if self.__acs is not None:
+                self.__acs_global_update()
+        if profiler is not None:
+            profiler.lap("deposit", start)
+
+    def get_best_found_path(self):
+        """Meilleur chemin nid -> nourriture trouvé (liste de City), ou None."""
+        return self.__best_path_cities
+
+    def get_best_found_length(self):
+        return self.__best_length
+
+    def get_iteration_best_path(self):
+        """Meilleur chemin du dernier step où la nourriture a été atteinte."""
+        return self.__iteration_best_path_cities
+
+    def get_iteration_best_length(self):
+        return self.__iteration_best_length
 
     def get_best_path(self):
         """
         Retourne une liste des City qui représente le meilleur chemin
         actuel du nid vers la food_source, en suivant la route
         ayant la plus forte quantité de phéromone à chaque étape.
+        Le chemin est mis en cache jusqu'à ce que le classement des routes
+        d'une ville par phéromone change : la liste retournée est partagée et
+        ne doit pas être modifiée.
         """
+        if self.__best_path_cache is None or (
+            self.__best_path_version != self.__ranking.get_version()
+        ):
+            self.__best_path_cache = self.__greedy_path()
+            self.__best_path_version = self.__ranking.get_version()
+        return self.__best_path_cache
+
+    def __greedy_path(self):
         path = []
         current_city = self.__nest
         path.append(current_city)
@@ -328,19 +511,13 @@ class Civilization:
 
         # Tant qu'on n'est pas arrivé à la food source
         while current_city != self.__food_source:
-            outgoing_roads = current_city.get_roads()
+            # Première route du classement menant à une ville non visitée
+            # (évite de repasser par une ville déjà visitée pour limiter les cycles)
             best_road = None
-            best_pheromone = -1
-
-            # Parcourir les routes sortantes
-            for road in outgoing_roads:
-                _, dest = road.get_cities()
-                # Évite de repasser par une ville déjà visitée pour limiter les cycles
-                if dest in visited:
-                    continue
-                if road.get_pheromone() > best_pheromone:
-                    best_pheromone = road.get_pheromone()
+            for road in self.__ranking.get_ranking(current_city):
+                if road.get_cities()[1] not in visited:
                     best_road = road
+                    break
 
             if best_road is None:
                 # Aucun chemin (sans cycle) n'a été trouvé
@@ -354,19 +531,52 @@ class Civilization:
 
         return path
 
-    def genetic_algo_application(self):
-        for i in range(self.__steps_genetic_algo):
+    def set_convergence_monitor(self, monitor: ConvergenceMonitor):
+        """
+        Installe un ConvergenceMonitor (None pour le retirer) : chaque
+        génération s'arrête dès qu'il détecte la convergence.
+        """
+        self.__convergence_monitor = monitor
+
+    def get_convergence_monitor(self):
+        return self.__convergence_monitor
+
+    def run_generation(self, steps: int = None, interrupted=None):
+        """
+        Lance au plus steps steps (par défaut steps_genetic_algo), en
+        s'arrêtant à la convergence si un moniteur est installé, ou avant un
+        step si interrupted() est vrai. Retourne le nombre de steps effectués.
+        """
+        if steps is None:
+            steps = self.__steps_genetic_algo
+        monitor = self.__convergence_monitor
+        if monitor is not None:
+            monitor.reset()
+        for i in range(steps):
+            if interrupted is not None and interrupted():
+                return i
             self.step()
+            if monitor is not None and monitor.update(self):
+                return i + 1
+        return steps
 
+    def genetic_algo_application(self):
+        self.run_generation()
+
+        profiler = self.__profiler
         threshold_genetic_algo = self.__threshold_genetic_algo
         while threshold_genetic_algo > 0:
+            if profiler is not None:
+                start = profiler.clock()
             self.genetic_algo()
-            for road in self.__roads:
-                road.reset_pheromone(self.__initial_pheromone)
+            if profiler is not None:
+                start = profiler.lap("genetic_algo", start)
+            self.reset_pheromones()
             for ant in self.__ants:
                 ant.reset_ant()
-            for i in range(self.__steps_genetic_algo):
-                self.step()
+            if profiler is not None:
+                profiler.lap("ga_reset", start)
+            self.run_generation()
             threshold_genetic_algo -= 1
 
     def algo_genetic_perf(self):
@@ -387,12 +597,16 @@ class Civilization:
         alpha_explore.append(best_explorer[0].get_parameters()[0])
         beta_explore.append(best_explorer[0].get_parameters()[1])
 
-        for i in range(self.__steps_genetic_algo):
-            self.step()
+        self.run_generation()
 
+        profiler = self.__profiler
         threshold_genetic_algo = self.__threshold_genetic_algo
         while threshold_genetic_algo > 0:
+            if profiler is not None:
+                start = profiler.clock()
             self.genetic_algo()
+            if profiler is not None:
+                profiler.lap("genetic_algo", start)
             best_worker = self.best_worker()
             best_explorer = self.best_explorer()
 
@@ -405,8 +619,7 @@ class Civilization:
 
             for ant in self.__ants:
                 ant.reset_ant()
-            for i in range(self.__steps_genetic_algo):
-                self.step()
+            self.run_generation()
 
             threshold_genetic_algo -= 1
 
@@ -0,0 +1,109 @@
+import math
+
+
+class ConvergenceMonitor:
+    """
+    Détecte la convergence d'une génération, step après step, à partir du
+    meilleur chemin de la civilisation (get_best_path) :
+    - stabilité : le meilleur chemin n'a pas changé depuis window steps ;
+    - amélioration : sa longueur n'a pas baissé de plus de
+      improvement_threshold (en relatif) depuis window steps ;
+    - concentration : la part des phéromones portée par ses routes atteint
+      concentration_threshold.
+    La convergence est atteinte quand tous les critères actifs le sont.
+    Le meilleur chemin n'est recalculé que tous les check_every steps.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        stability: bool = True,
+        improvement_threshold: float = None,
+        concentration_threshold: float = None,
+        check_every: int = 1,
+    ):
+        assert window > 0 and check_every > 0
+        assert (
+            stability
+            or improvement_threshold is not None
+            or concentration_threshold is not None
+        )
+        self.__window = window
+        self.__stability = stability
+        self.__improvement_threshold = improvement_threshold
+        self.__concentration_threshold = concentration_threshold
+        self.__check_every = check_every
+        self.reset()
+
+    def reset(self):
+        """À appeler au début de chaque génération."""
+        self.__steps = 0
+        self.__best_path = None
+        self.__best_path_ids = None
+        self.__best_path_roads = []
+        self.__stable_since = 0
+        self.__reference_length = math.inf
+        self.__improved_at = 0
+        self.__converged_at = None
+
+    def has_converged(self):
+        return self.__converged_at is not None
+
+    def get_converged_at(self):
+        """Step (dans la génération) où la convergence a été détectée."""
+        return self.__converged_at
+
+    def get_stable_since(self):
+        """Step depuis lequel le meilleur chemin n'a pas changé."""
+        return self.__stable_since
+
+    def update(self, civ):
+        """Observe la civilisation après un step ; retourne has_converged()."""
+        self.__steps += 1
+        if self.has_converged() or self.__steps % self.__check_every != 0:
+            return self.has_converged()
+
+        path = civ.get_best_path()
+        # get_best_path retourne le même objet tant que le chemin est en cache
+        if path is not self.__best_path:
+            self.__best_path = path
+            self.__best_path_roads = [
+                civ.get_road_by_cities(a, b) for a, b in zip(path, path[1:])
+            ]
+            ids = [city.get_id() for city in path]
+            if ids != self.__best_path_ids:
+                self.__best_path_ids = ids
+                self.__stable_since = self.__steps
+        roads = self.__best_path_roads
+
+        length = math.inf if None in roads else sum(road.get_weight() for road in roads)
+        if self.__improvement_threshold is None:
+            improved = length < self.__reference_length
+        else:
+            improved = length < self.__reference_length * (
+                1 - self.__improvement_threshold
+            )
+        if improved:
+            self.__reference_length = length
+            self.__improved_at = self.__steps
+
+        criteria = []
+        if self.__stability:
+            criteria.append(self.__steps - self.__stable_since >= self.__window)
+        if self.__improvement_threshold is not None:
+            criteria.append(self.__steps - self.__improved_at >= self.__window)
+        if self.__concentration_threshold is not None:
+            criteria.append(
+                self.concentration(civ, roads) >= self.__concentration_threshold
+            )
+        if all(criteria):
+            self.__converged_at = self.__steps
+        return self.has_converged()
+
+    @staticmethod
+    def concentration(civ, roads):
+        """Part des phéromones de la civilisation portée par roads."""
+        total = sum(road.get_pheromone() for road in civ.get_roads())
+        if total == 0 or None in roads:
+            return 0.0
+        return sum(road.get_pheromone() for road in set(roads)) / total
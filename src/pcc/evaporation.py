@@ -0,0 +1,34 @@
+import math
+
+
+class EvaporationClock:
+    """
+    Évaporation paresseuse partagée par les routes d'une civilisation : au
+    lieu de multiplier chaque route à chaque step, on cumule le logarithme du
+    facteur de décroissance. Chaque route retient l'exposant de son dernier
+    accès et n'applique la décroissance accumulée que lorsqu'elle est lue ou
+    modifiée.
+    """
+
+    def __init__(self, evaporation_rate: float):
+        assert 0 < evaporation_rate < 1
+        self.__evaporation_rate = evaporation_rate
+        self.__log_decay = math.log(1 - evaporation_rate)
+        self.__exponent = 0.0
+
+    def get_evaporation_rate(self):
+        return self.__evaporation_rate
+
+    def get_exponent(self):
+        return self.__exponent
+
+    def tick(self):
+        """Un step d'évaporation pour toutes les routes, en O(1)."""
+        self.__exponent += self.__log_decay
+        return
+
+    def scale(self, factor: float):
+        """Multiplie toutes les phéromones par factor (ex. division par deux)."""
+        assert factor > 0
+        self.__exponent += math.log(factor)
+        return
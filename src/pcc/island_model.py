@@ -0,0 +1,127 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from pcc.civilization import Civilization
+from pcc.parallel_ga import build_civilization, export_civilization
+
+
+def evolve_island(spec, genomes, generations: int, seed: int):
+    """
+    Fait évoluer la population d'une île pendant generations générations,
+    avec la même boucle que genetic_algo_application. Retourne la population
+    triée de la meilleure à la pire travailleuse, sous la forme
+    ((alpha, beta), nourriture, chemins explorés).
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    civ = build_civilization(spec)
+    for alpha, beta in genomes:
+        civ.create_ant_colony(1, alpha, beta)
+    civ.run_generation()
+    for _ in range(generations):
+        civ.genetic_algo()
+        civ.reset_pheromones()
+        for ant in civ.get_ants():
+            ant.reset_ant()
+        civ.run_generation()
+    ants = sorted(civ.get_ants(), key=lambda ant: ant.get_food_quantity(), reverse=True)
+    return [
+        (ant.get_parameters(), ant.get_food_quantity(), ant.get_explored_roads_count())
+        for ant in ants
+    ]
+
+
+class IslandModel:
+    """
+    Algorithme génétique en îles : K colonies indépendantes évoluent sur le
+    même graphe, chacune dans son processus. Toutes les migration_interval
+    générations, les migrants meilleurs génomes de chaque île remplacent les
+    pires d'une autre île, en anneau ("ring") ou au hasard ("random").
+    """
+
+    def __init__(
+        self,
+        civ: Civilization,
+        islands: int = 4,
+        migration_interval: int = 10,
+        topology: str = "ring",
+        migrants: int = 1,
+        seed: int = None,
+        max_workers: int = None,
+    ):
+        assert islands > 1
+        assert topology in ("ring", "random")
+        self.__civ = civ
+        self.__islands = islands
+        self.__migration_interval = migration_interval
+        self.__topology = topology
+        self.__migrants = migrants
+        self.__rng = random.Random(seed)
+        self.__max_workers = max_workers if max_workers is not None else islands
+        self.__populations = None
+
+    def get_populations(self):
+        return self.__populations
+
+    def __initial_populations(self):
+        # La première île part de la colonie actuelle, les autres de génomes
+        # tirés comme lors d'une migration
+        genomes = [ant.get_parameters() for ant in self.__civ.get_ants()]
+        populations = [genomes]
+        for _ in range(self.__islands - 1):
+            populations.append(
+                [(self.__rng.uniform(0, 5), self.__rng.uniform(0, 5)) for _ in genomes]
+            )
+        return populations
+
+    def __migration_target(self, island: int):
+        if self.__topology == "ring":
+            return (island + 1) % self.__islands
+        return self.__rng.choice([i for i in range(self.__islands) if i != island])
+
+    def migrate(self, results):
+        """Les élites de chaque île remplacent les pires individus de leur cible."""
+        populations = [[genome for genome, _, _ in result] for result in results]
+        for island, result in enumerate(results):
+            elites = [genome for genome, _, _ in result[: self.__migrants]]
+            target = populations[self.__migration_target(island)]
+            target[len(target) - len(elites) :] = elites
+        return populations
+
+    def run(self, generations: int = None):
+        """
+        Lance generations générations par île (par défaut le seuil de la
+        civilisation). La colonie de la civilisation est remplacée par la
+        population de l'île qui contient la meilleure travailleuse, qui est
+        retournée sous la forme ((alpha, beta), nourriture, chemins explorés).
+        """
+        if generations is None:
+            generations = self.__civ.get_threshold_genetic_algo()
+        assert generations > 0
+        spec = export_civilization(self.__civ)
+        populations = self.__initial_populations()
+        results = None
+        with ProcessPoolExecutor(self.__max_workers) as executor:
+            remaining = generations
+            while remaining > 0:
+                epoch = min(self.__migration_interval, remaining)
+                seeds = [self.__rng.randrange(2**32) for _ in populations]
+                results = list(
+                    executor.map(
+                        evolve_island, repeat(spec), populations, repeat(epoch), seeds
+                    )
+                )
+                remaining -= epoch
+                if remaining > 0:
+                    populations = self.migrate(results)
+        self.__populations = [[genome for genome, _, _ in result] for result in results]
+
+        best_island = max(results, key=lambda result: result[0][1])
+        self.__civ.reset_ants()
+        for (alpha, beta), food_quantity, explored_roads_count in best_island:
+            self.__civ.create_ant_colony(1, alpha, beta)
+            self.__civ.get_ants()[-1].load_fitness(food_quantity, explored_roads_count)
+        return best_island[0]
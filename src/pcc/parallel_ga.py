@@ -0,0 +1,142 @@
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from pcc.city import City
+from pcc.civilization import Civilization
+
+
+def export_civilization(civ: Civilization, with_positions: bool = False):
+    """
+    Décrit le graphe, les paramètres et les réglages (variante de l'algorithme,
+    arrêt anticipé...) d'une civilisation sous une forme sérialisable, pour
+    la reconstruire dans un autre processus.
+    Les positions (objets Qt) ne sont exportées que sur demande.
+    """
+    return {
+        "nest": civ.get_nest().get_id(),
+        "food_source": civ.get_food_source().get_id(),
+        "cities": [
+            (city.get_id(), city.get_position() if with_positions else None)
+            for city in civ.get_cities()
+        ],
+        "roads": [
+            (
+                road.get_weight(),
+                road.get_cities()[0].get_id(),
+                road.get_cities()[1].get_id(),
+            )
+            for road in civ.get_roads()
+        ],
+        "parameters": (
+            civ.get_evaporation_rate(),
+            civ.get_initial_pheromone(),
+            civ.get_mutation_factor(),
+            civ.get_steps_genetic_algo(),
+        ),
+        "settings": {
+            "acs": civ.get_acs(),
+            "convergence_monitor": civ.get_convergence_monitor(),
+        },
+    }
+
+
+def build_civilization(spec) -> Civilization:
+    """Reconstruit une civilisation sans fourmis à partir de export_civilization."""
+    cities = {city_id: City(city_id, position) for city_id, position in spec["cities"]}
+    civ = Civilization(
+        cities[spec["nest"]], cities[spec["food_source"]], *spec["parameters"]
+    )
+    for city_id, _ in spec["cities"]:
+        if city_id not in (spec["nest"], spec["food_source"]):
+            civ.add_city(cities[city_id])
+    for weight, start_id, end_id in spec["roads"]:
+        civ.add_road(weight, cities[start_id], cities[end_id])
+
+    settings = spec["settings"]
+    if settings["acs"] is not None:
+        civ.set_acs(True, *settings["acs"])
+    if settings["convergence_monitor"] is not None:
+        # Chaque civilisation reconstruite a son propre moniteur
+        civ.set_convergence_monitor(copy.deepcopy(settings["convergence_monitor"]))
+    return civ
+
+
+# Graphe partagé par toutes les tâches d'un processus de travail
+_worker_spec = None
+
+
+def _init_worker(spec):
+    global _worker_spec
+    _worker_spec = spec
+
+
+def evaluate_genome(genome, seed: int, ants_per_candidate: int = 1, spec=None):
+    """
+    Évalue un génome (alpha, beta) sur sa propre copie de la colonie :
+    ants_per_candidate fourmis de ce génome parcourent le graphe pendant une
+    génération (run_generation). Retourne la fitness de la première fourmi
+    (nourriture récoltée, chemins explorés).
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    civ = build_civilization(spec if spec is not None else _worker_spec)
+    civ.create_ant_colony(ants_per_candidate, genome[0], genome[1])
+    civ.run_generation()
+    ant = civ.get_ants()[0]
+    return ant.get_food_quantity(), ant.get_explored_roads_count()
+
+
+class ParallelGeneticAlgorithm:
+    """
+    Variante de genetic_algo_application qui évalue les génomes des fourmis
+    dans un pool de processus. Chaque candidat est évalué sur sa propre copie
+    du graphe avec sa propre graine ; les fitness sont ensuite rechargées dans
+    les fourmis de la civilisation, qui suit la même sélection, le même
+    croisement et les mêmes mutations que genetic_algo.
+    """
+
+    def __init__(
+        self,
+        civ: Civilization,
+        max_workers: int = None,
+        seed: int = None,
+        ants_per_candidate: int = 1,
+    ):
+        self.__civ = civ
+        self.__max_workers = max_workers
+        self.__rng = random.Random(seed)
+        self.__ants_per_candidate = ants_per_candidate
+
+    def evaluate(self, executor):
+        ants = self.__civ.get_ants()
+        genomes = [ant.get_parameters() for ant in ants]
+        seeds = [self.__rng.randrange(2**32) for _ in ants]
+        results = executor.map(
+            evaluate_genome, genomes, seeds, repeat(self.__ants_per_candidate)
+        )
+        for ant, (food_quantity, explored_roads_count) in zip(ants, results):
+            ant.load_fitness(food_quantity, explored_roads_count)
+
+    def run(self, generations: int = None, on_generation=None):
+        """
+        Lance generations générations (par défaut le seuil de la civilisation).
+        on_generation(generation) est appelé après chaque génération.
+        Retourne la meilleure travailleuse (fourmi, nourriture, exploration).
+        """
+        if generations is None:
+            generations = self.__civ.get_threshold_genetic_algo()
+        spec = export_civilization(self.__civ)
+        with ProcessPoolExecutor(
+            self.__max_workers, initializer=_init_worker, initargs=(spec,)
+        ) as executor:
+            self.evaluate(executor)
+            for generation in range(generations):
+                self.__civ.genetic_algo()
+                self.evaluate(executor)
+                if on_generation is not None:
+                    on_generation(generation)
+        return self.__civ.best_worker()
@@ -0,0 +1,55 @@
+class PheromoneRanking:
+    """
+    Classement des routes de chaque ville par phéromone décroissante (à
+    égalité, dans l'ordre de City.get_roads()), comme les parcourt
+    get_best_path. Les classements sont construits au premier besoin ;
+    road_changed ne retrie une ville que si la route y a réellement changé
+    de rang, et get_version() n'augmente qu'à ces occasions. L'évaporation,
+    uniforme, ne change aucun rang.
+    """
+
+    def __init__(self):
+        self.__rankings = {}  # id de ville -> routes triées
+        self.__positions = {}  # id de ville -> {route: rang}
+        self.__orders = {}  # id de ville -> {route: indice dans get_roads()}
+        self.__version = 0
+
+    def get_version(self):
+        return self.__version
+
+    def __key(self, city, road):
+        return -road.get_pheromone(), self.__orders[city.get_id()][road]
+
+    def __sort(self, city):
+        ranking = sorted(city.get_roads(), key=lambda road: self.__key(city, road))
+        self.__rankings[city.get_id()] = ranking
+        self.__positions[city.get_id()] = {road: k for k, road in enumerate(ranking)}
+
+    def get_ranking(self, city):
+        if city.get_id() not in self.__rankings:
+            roads = city.get_roads()
+            self.__orders[city.get_id()] = {road: k for k, road in enumerate(roads)}
+            self.__sort(city)
+        return self.__rankings[city.get_id()]
+
+    def forget(self, city):
+        """À appeler quand les routes de city changent."""
+        self.__rankings.pop(city.get_id(), None)
+        self.__positions.pop(city.get_id(), None)
+        self.__orders.pop(city.get_id(), None)
+        self.__version += 1
+
+    def road_changed(self, road):
+        """Appelé après chaque modification non uniforme de la phéromone de road."""
+        # Routes orientées : seul le classement de la ville de départ change
+        for city in road.get_cities()[:1]:
+            ranking = self.__rankings.get(city.get_id())
+            if ranking is None:
+                continue
+            k = self.__positions[city.get_id()][road]
+            key = self.__key(city, road)
+            if (k > 0 and self.__key(city, ranking[k - 1]) > key) or (
+                k + 1 < len(ranking) and self.__key(city, ranking[k + 1]) < key
+            ):
+                self.__sort(city)
+                self.__version += 1
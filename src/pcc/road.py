@@ -1,13 +1,26 @@
+import math
+
 from pcc.ant import Ant
 from pcc.city import City
+from pcc.evaporation import EvaporationClock
 
 
 class Road:
     def __init__(
-        self, weight: float, start_city: City, end_city: City, initial_pheromone: float
+        self,
+        weight: float,
+        start_city: City,
+        end_city: City,
+        initial_pheromone: float,
+        clock: EvaporationClock = None,
     ):
         self.__weight = weight
         self.__pheromone = initial_pheromone
+        # Évaporation paresseuse : exposant de l'horloge au dernier accès
+        self.__clock = clock
+        self.__stamp = clock.get_exponent() if clock is not None else 0.0
+        # Prévenu de chaque modification non uniforme de la phéromone
+        self.__listener = None
         self.__start_city = start_city
         self.__end_city = end_city
 
@@ -17,11 +30,36 @@ class Road:
     def get_weight(self):
         return self.__weight
 
+    def __apply_evaporation(self):
+        # Applique d'un coup la décroissance accumulée depuis le dernier accès
+        if self.__clock is None:
+            return
+        exponent = self.__clock.get_exponent()
+        if exponent != self.__stamp:
+            self.__pheromone *= math.exp(exponent - self.__stamp)
+            self.__stamp = exponent
+
+    def set_listener(self, listener):
+        """listener(road) est appelé après chaque dépôt ou affectation."""
+        self.__listener = listener
+
+    def __notify(self):
+        if self.__listener is not None:
+            self.__listener(self)
+
+    def __touch(self):
+        if self.__clock is not None:
+            self.__stamp = self.__clock.get_exponent()
+
     def get_pheromone(self):
+        self.__apply_evaporation()
         return self.__pheromone
 
     def add_pheromone(self, pheromone: float):
+        self.__apply_evaporation()
         self.__pheromone += pheromone
+        self.__start_city.bump_pheromone_version()
+        self.__notify()
         return
 
     def get_cities(self):
@@ -29,17 +67,32 @@ class Road:
 
     def set_pheromone(self, pheromone: float):
         self.__pheromone = pheromone
+        self.__touch()
+        self.__start_city.bump_pheromone_version()
+        self.__notify()
 
     def reset_pheromone(self, initial_value):
         self.__pheromone = initial_value
+        self.__touch()
+        self.__start_city.bump_pheromone_version()
+        self.__notify()
 
-    def evaporate_pheromone(self):
-        rho = 0.05
+    def evaporate_pheromone(self, rho: float):
+        """Évaporation immédiate de cette seule route."""
+        self.__apply_evaporation()
         self.__pheromone *= 1 - rho
+        self.__start_city.bump_pheromone_version()
+        self.__notify()
         return
 
     def reverse(self):
-        return Road(self.__weight, self.__end_city, self.__start_city, self.__pheromone)
+        return Road(
+            self.__weight,
+            self.__end_city,
+            self.__start_city,
+            self.get_pheromone(),
+            self.__clock,
+        )
 
     def __str__(self):
-        return f"Road ({self.__start_city.get_id()}, {self.__end_city.get_id()}):\n\tWeight: {self.__weight}\n\tPheromone: {self.__pheromone}"
+        return f"Road ({self.__start_city.get_id()}, {self.__end_city.get_id()}):\n\tWeight: {self.__weight}\n\tPheromone: {self.get_pheromone()}"
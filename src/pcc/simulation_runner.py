@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from pcc.civilization import Civilization
+
+
+def take_snapshot(civ: Civilization, index):
+    """
+    Relevé de l'état dynamique de la civilisation, lisible par le thread de
+    l'interface pendant que le moteur continue : nombre de steps, phéromone
+    de chaque route (ordre de get_roads), villes courante et suivante de
+    chaque fourmi (indices de index, -1 si aucune) et meilleur chemin.
+    """
+    roads = civ.get_roads()
+    ants = civ.get_ants()
+    best_path = civ.get_best_path()
+    return {
+        "steps": civ.steps,
+        "pheromones": np.fromiter(
+            (road.get_pheromone() for road in roads), dtype=float, count=len(roads)
+        ),
+        "current": np.fromiter(
+            (index[ant.get_current_city()] for ant in ants),
+            dtype=int,
+            count=len(ants),
+        ),
+        "next": np.fromiter(
+            (
+                -1 if ant.get_next_city() is None else index[ant.get_next_city()]
+                for ant in ants
+            ),
+            dtype=int,
+            count=len(ants),
+        ),
+        "best_path": [city.get_id() for city in best_path] if best_path else None,
+    }
+
+
+class SimulationRunner(QThread):
+    """
+    Fait tourner le moteur (step() en boucle) dans un thread séparé,
+    indépendamment de l'affichage : jusqu'au step target_step, ou sans fin
+    si target_step est None. Un relevé (take_snapshot) est émis au plus
+    toutes les snapshot_interval secondes, et à l'arrêt. Tant que le thread
+    tourne, seul lui modifie la civilisation ; le canvas dessine le dernier
+    relevé.
+    """
+
+    snapshot = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        civ: Civilization,
+        target_step: int = None,
+        snapshot_interval: float = 0.03,
+        parent=None,
+    ):
+        super().__init__(parent)
+        assert snapshot_interval >= 0
+        self.__civ = civ
+        self.__target_step = target_step
+        self.__snapshot_interval = snapshot_interval
+        self.__index = {city: i for i, city in enumerate(civ.get_cities())}
+
+    def get_target_step(self):
+        return self.__target_step
+
+    def set_target_step(self, target_step: int):
+        """Change le step d'arrêt (None : sans fin) pendant l'exécution."""
+        self.__target_step = target_step
+
+    def stop(self):
+        """Demande l'arrêt ; le thread s'arrête à la fin du step en cours."""
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            last_snapshot = time.perf_counter()
+            while not self.isInterruptionRequested():
+                target_step = self.__target_step
+                if target_step is not None and self.__civ.steps >= target_step:
+                    break
+                self.__civ.step()
+                now = time.perf_counter()
+                if now - last_snapshot >= self.__snapshot_interval:
+                    self.snapshot.emit(take_snapshot(self.__civ, self.__index))
+                    last_snapshot = now
+            self.snapshot.emit(take_snapshot(self.__civ, self.__index))
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
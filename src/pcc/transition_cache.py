@@ -0,0 +1,61 @@
+import random
+from itertools import accumulate
+
+
+class TransitionTable:
+    """
+    Loi de transition depuis une ville pour un couple (alpha, beta), stockée
+    sous forme de distribution cumulée : un tirage est une recherche
+    dichotomique, sans recalcul des poids.
+    """
+
+    def __init__(self, roads, alpha: float, beta: float):
+        self.__roads = list(roads)
+        weights = [
+            (road.get_pheromone() ** alpha) * ((1 / road.get_weight()) ** beta)
+            for road in self.__roads
+        ]
+        self.__cumulated_weights = list(accumulate(weights))
+        self.__beta = beta
+        self.__best_road = None  # calculée au premier besoin
+
+    def is_empty(self):
+        return not self.__cumulated_weights or self.__cumulated_weights[-1] == 0
+
+    def get_best_road(self):
+        # Exploitation : route de poids maximal, comme dans Ant.weighted_choice
+        if self.__best_road is None:
+            self.__best_road = max(
+                self.__roads,
+                key=lambda road: road.get_pheromone()
+                * ((1 / road.get_weight()) ** self.__beta),
+            )
+        return self.__best_road
+
+    def sample(self):
+        cumulated_weights = self.__cumulated_weights
+        return random.choices(self.__roads, cum_weights=cumulated_weights, k=1)[0]
+
+
+class TransitionCache:
+    """
+    Tables de transition indexées par (ville, alpha, beta). Une table n'est
+    reconstruite que si la version de phéromone de la ville a changé, c'est à
+    dire après un dépôt ou une réinitialisation sur l'une de ses routes.
+    L'évaporation, uniforme, ne modifie pas les probabilités.
+    """
+
+    def __init__(self):
+        self.__tables = {}  # (id de ville, alpha, beta) -> (version, table)
+
+    def get(self, city, alpha: float, beta: float):
+        key = (city.get_id(), alpha, beta)
+        version = city.get_pheromone_version()
+        entry = self.__tables.get(key)
+        if entry is None or entry[0] != version:
+            entry = (version, TransitionTable(city.get_roads(), alpha, beta))
+            self.__tables[key] = entry
+        return entry[1]
+
+    def clear(self):
+        self.__tables = {}
@@ -1,17 +1,7 @@
 import random
-import sys
-
-from PyQt5.QtCore import QPointF
-from PyQt5.QtGui import QSurfaceFormat
-from PyQt5.QtWidgets import QApplication
 
 from pcc.city import City
 from pcc.civilization import Civilization
-from pcc.visualizer import Visualizer
-
-fmt = QSurfaceFormat()
-fmt.setSamples(8)
-QSurfaceFormat.setDefaultFormat(fmt)
 
 
 def get_small_civ_pcc():
@@ -122,15 +112,11 @@ def get_really_big_civ_pcc():
 
 
 def get_empty_civ_pcc():
+    # Seul le mode édition a besoin de positions Qt : import local pour que
+    # les fixtures restent utilisables sans charger Qt
+    from PyQt5.QtCore import QPointF
+
     nest = City(0, QPointF(500, 400))
     food_source = City(99, QPointF(1500, 400))
     civ = Civilization(nest, food_source, 0.05, 0.1, 0.1, 50)
     return civ
-
-
-def main_pcc(civ: Civilization, edition_mode):
-    app = QApplication(sys.argv)
-    window = Visualizer(civ, edition_mode)
-    window.showMaximized()
-
-    sys.exit(app.exec_())
@@ -1,10 +1,22 @@
 import math
+import sys
 import time
 
 import matplotlib.pyplot as plt
-from PyQt5.QtCore import QPointF, Qt, QTimer
-from PyQt5.QtGui import QBrush, QColor, QFont, QIcon, QPainter, QPen, QPolygonF
+import numpy as np
+from PyQt5.QtCore import QPointF, QRectF, Qt, QTimer
+from PyQt5.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QIcon,
+    QPainter,
+    QPen,
+    QPolygonF,
+    QSurfaceFormat,
+)
 from PyQt5.QtWidgets import (
+    QApplication,
     QCheckBox,
     QColorDialog,
     QFormLayout,
@@ -17,11 +29,22 @@ from PyQt5.QtWidgets import (
     QPushButton,
     QScrollArea,
     QSlider,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
+from pcc.ant_layer import AntLayer
 from pcc.city import City
+from pcc.ga_worker import GeneticAlgorithmWorker
+from pcc.gl_renderer import GraphRenderer
+from pcc.label_cache import LabelCache
+from pcc.palette import AntPalette
+from pcc.simulation_runner import SimulationRunner, take_snapshot
+
+fmt = QSurfaceFormat()
+fmt.setSamples(8)
+QSurfaceFormat.setDefaultFormat(fmt)
 
 
 class Visualizer(QWidget):
@@ -86,6 +109,70 @@ class Visualizer(QWidget):
         self.road_text_checkbox.raise_()
         show_text_layout.addWidget(self.road_text_checkbox)
 
+        # Horloge de la simulation, indépendante de l'affichage
+        self.simulation_group = QGroupBox(self)
+        self.simulation_group.setGeometry(1560, 400, 240, 260)
+        self.simulation_group.setStyleSheet(
+            """
+            QGroupBox {
+                background-color: #282828;
+                border-radius: 20px;
+                padding: 15px;
+                font-family: Roboto;
+                border: 5px solid rgba(255, 255, 255, 0.2);
+            }
+            QLabel, QCheckBox {
+                color: white;
+                font-family: Roboto;
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QSpinBox {
+                padding: 3px;
+                border-radius: 5px;
+            }
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                border-radius: 5px;
+                padding: 5px;
+            }
+            """
+        )
+        simulation_layout = QVBoxLayout(self.simulation_group)
+
+        # Nombre de steps par image (0 : un step quand les fourmis arrivent)
+        steps_layout = QHBoxLayout()
+        steps_layout.addWidget(QLabel("Steps / image:"))
+        self.steps_per_frame_input = QSpinBox()
+        self.steps_per_frame_input.setRange(0, 10000)
+        self.steps_per_frame_input.valueChanged.connect(self.canvas.set_steps_per_frame)
+        steps_layout.addWidget(self.steps_per_frame_input)
+        simulation_layout.addLayout(steps_layout)
+
+        # Simulation libre dans un thread, l'affichage suit le dernier relevé
+        self.background_checkbox = QCheckBox("Simulation en continu")
+        self.background_checkbox.stateChanged.connect(
+            lambda state: self.canvas.set_background_run(state == Qt.Checked)
+        )
+        simulation_layout.addWidget(self.background_checkbox)
+
+        # Avance rapide jusqu'à un step donné
+        fast_forward_layout = QHBoxLayout()
+        self.target_step_input = QSpinBox()
+        self.target_step_input.setRange(1, 10**7)
+        self.target_step_input.setValue(1000)
+        fast_forward_layout.addWidget(self.target_step_input)
+        self.fast_forward_button = QPushButton("⏩ Aller")
+        self.fast_forward_button.clicked.connect(
+            lambda: self.canvas.fast_forward(self.target_step_input.value())
+        )
+        fast_forward_layout.addWidget(self.fast_forward_button)
+        simulation_layout.addLayout(fast_forward_layout)
+
+        self.step_counter = QLabel("Step: 0")
+        simulation_layout.addWidget(self.step_counter)
+
         # Création du groupe pour l'algorithme génétique
         self.genetic_group = QGroupBox("Algorithme Génétique", self)
         self.genetic_group.setGeometry(100, 600, 300, 450)
@@ -212,11 +299,99 @@ class Visualizer(QWidget):
         self.genetic_group.setGeometry(60, 540, 395, 420)
         super().resizeEvent(event)
 
+    def closeEvent(self, event):
+        self.canvas.stop_genetic_algorithm()
+        self.canvas.stop_simulation_runner()
+        super().closeEvent(event)
+
     def toggleRoadText(self, state):
         show_text = state == Qt.Checked
         self.canvas.setShowRoadText(show_text)
 
 
+class BestPathPanel(QGroupBox):
+    """
+    Panneau du meilleur chemin : une étiquette par ville, séparées par des
+    flèches. Les widgets sont conservés d'un chemin à l'autre ; set_path ne
+    modifie que les étiquettes qui diffèrent et masque celles en trop.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__("Chemin Optimal", parent)
+        self.setStyleSheet(
+            """
+            QGroupBox {
+                background-color: #282828;
+                border-radius: 15px;
+                padding: 15px;
+                font-family: Roboto;
+                color: white;
+                border: 5px solid rgba(255, 255, 255, 0.2);
+                font-size: 26px;
+                margin-top: 25px;
+            }
+            QGroupBox::title {
+                font-size: 26px;
+                font-weight: bold;
+                subcontrol-origin: margin;
+                subcontrol-position: top center;
+                color: white;
+                font-family: 'Roboto';
+                top: 10px;  /* Move the title down a bit */
+            }
+            """
+        )
+        layout = QVBoxLayout(self)
+
+        # Widget contenant le chemin
+        path_widget = QWidget()
+        path_widget.setStyleSheet(
+            "background-color: #333333; border-radius: 10px; padding: 15px;"
+        )
+        self.path_flow = QHBoxLayout(path_widget)
+        self.path_flow.setSpacing(15)
+        self.path_flow.setAlignment(Qt.AlignCenter)
+        self.path_flow.setContentsMargins(10, 10, 10, 10)
+        layout.addWidget(path_widget)
+
+        self.city_labels = []
+        self.arrows = []  # arrows[i] suit city_labels[i]
+        self.city_ids = []
+
+    def add_city_label(self):
+        city_label = QLabel()
+        city_label.setFixedSize(60, 60)
+        city_label.setStyleSheet(
+            """
+            background-color: #4CAF50;
+            color: white;
+            font-weight: bold;
+            border-radius: 20px;
+            font-size: 16px;
+            qproperty-alignment: AlignCenter;
+            """
+        )
+        arrow = QLabel("→")
+        arrow.setStyleSheet("color: white; font-size: 24px;")
+        self.path_flow.addWidget(city_label)
+        self.path_flow.addWidget(arrow)
+        self.city_labels.append(city_label)
+        self.arrows.append(arrow)
+
+    def set_path(self, city_ids):
+        """Affiche le chemin city_ids (identifiants des villes, en texte)."""
+        if city_ids == self.city_ids:
+            return
+        while len(self.city_labels) < len(city_ids):
+            self.add_city_label()
+        for i, (city_label, arrow) in enumerate(zip(self.city_labels, self.arrows)):
+            if i < len(city_ids) and city_label.text() != city_ids[i]:
+                city_label.setText(city_ids[i])
+            city_label.setVisible(i < len(city_ids))
+            arrow.setVisible(i < len(city_ids) - 1)
+        self.city_ids = list(city_ids)
+
+
 # Canvas de base
 class BaseCanvas(QOpenGLWidget):
     def __init__(self, civ, edition_mode: bool, parent=None):
@@ -225,22 +400,30 @@ class BaseCanvas(QOpenGLWidget):
         self.cached_layout = None
         self.is_edition_mode = edition_mode
         self.ants = self.civ.get_ants()
-        self.ant_progress = {ant: 0.0 for ant in self.ants}
+        self.ant_palette = AntPalette()
+        # Avancement des fourmis sur leur route, voir restart_ant_layer
+        self.ant_layer = AntLayer()
+        # Horloge de la simulation : steps_per_frame steps à chaque image, ou
+        # un step quand toutes les fourmis sont arrivées s'il vaut 0. Pendant
+        # qu'un SimulationRunner tourne, le canvas dessine son dernier relevé.
+        self.steps_per_frame = 0
+        self.background_run = False
+        self.runner = None
+        self.snapshot = None
         self.ant_speed = 1.0
         self.last_update = time.time()
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.updateAnimation)
         self.timer.start(16)  # environ 60 FPS
-        self.start_time = time.time()
-        self.ant_launch_delta = self.ant_speed * 0.04
-        self.ant_launch_time = {
-            ant: self.start_time + i * self.ant_launch_delta
-            for i, ant in enumerate(self.ants)
-        }
+        self.restart_ant_layer()
         self.best_path_text = "Chemin Optimal: N/A"
         self.show_road_text = True
+        self.ga_worker = None  # GeneticAlgorithmWorker en cours
+        self.renderer = None  # GraphRenderer, créé par initializeGL
+        self.label_cache = LabelCache()  # textes des villes et des routes
+        self.path_display = None  # BestPathPanel
+        self.path_display_text = None  # best_path_text affiché par path_display
         self.best_path = None
-        self.step_without_change = 0
 
         # Initialisation commune des widgets
         self.init_input_widgets()
@@ -398,86 +581,19 @@ class BaseCanvas(QOpenGLWidget):
         self.selected_color = color
 
     def display_best_path_window(self):
-        """Affiche ou met à jour la fenêtre du meilleur chemin."""
-        # Désactiver les mises à jour pour éviter les lags
-        self.setUpdatesEnabled(False)
+        """Met à jour le panneau du meilleur chemin si best_path_text a changé."""
+        if self.path_display is None:
+            self.path_display = BestPathPanel(self)
+            self.path_display.setFixedWidth(1260)
+            self.path_display.move(540, 40)
+            self.path_display.show()
+        elif self.best_path_text == self.path_display_text:
+            return
+        self.path_display_text = self.best_path_text
 
         # Extraire les identifiants des villes
         city_ids = self.best_path_text.replace("Chemin Optimal: ", "").split("→")
-
-        # Vérifier si le widget existe déjà
-        if hasattr(self, "path_display"):
-            # Nettoyer l'ancien contenu pour éviter de recréer des widgets
-            for i in reversed(range(self.path_display_layout.count())):
-                self.path_display_layout.itemAt(i).widget().deleteLater()
-        else:
-            # Créer un QGroupBox seulement si ce n'est pas déjà fait
-            self.path_display = QGroupBox("Chemin Optimal", self)
-            self.path_display.setStyleSheet(
-                """
-                QGroupBox {
-                    background-color: #282828;
-                    border-radius: 15px;
-                    padding: 15px;
-                    font-family: Roboto;
-                    color: white;
-                    border: 5px solid rgba(255, 255, 255, 0.2);
-                    font-size: 26px;
-                    margin-top: 25px;
-                }
-                QGroupBox::title {
-                    font-size: 26px;
-                    font-weight: bold;
-                    subcontrol-origin: margin;
-                    subcontrol-position: top center;
-                    color: white;
-                    font-family: 'Roboto';
-                    top: 10px;  /* Move the title down a bit */
-                }
-                """
-            )
-            self.path_display_layout = QVBoxLayout(self.path_display)
-
-        # Création d'un widget contenant le chemin
-        path_widget = QWidget()
-        path_widget.setStyleSheet(
-            "background-color: #333333; border-radius: 10px; padding: 15px;"
-        )
-
-        path_flow = QHBoxLayout(path_widget)
-        path_flow.setSpacing(15)
-        path_flow.setAlignment(Qt.AlignCenter)
-        path_flow.setContentsMargins(10, 10, 10, 10)
-
-        # Ajouter chaque ville avec une flèche entre elles
-        for i, city_id in enumerate(city_ids):
-            city_label = QLabel(city_id)
-            city_label.setFixedSize(60, 60)
-            city_label.setStyleSheet(
-                """
-                background-color: #4CAF50;
-                color: white;
-                font-weight: bold;
-                border-radius: 20px;
-                font-size: 16px;
-                qproperty-alignment: AlignCenter;
-                """
-            )
-            path_flow.addWidget(city_label)
-
-            if i < len(city_ids) - 1:
-                arrow = QLabel("→")
-                arrow.setStyleSheet("color: white; font-size: 24px;")
-                path_flow.addWidget(arrow)
-
-        # Ajouter le widget du chemin à la layout principale
-        self.path_display_layout.addWidget(path_widget)
-        self.path_display.setFixedWidth(1260)
-        self.path_display.move(540, 40)
-        self.path_display.show()
-
-        # Réactiver les mises à jour
-        self.setUpdatesEnabled(True)
+        self.path_display.set_path(city_ids)
 
     def updateAntSpeed(self, value):
         """Met à jour le label et la vitesse des fourmis."""
@@ -485,6 +601,8 @@ class BaseCanvas(QOpenGLWidget):
         self.setAntSpeed(value)
 
     def compose_colony_ants(self):
+        if self.ga_worker is not None or self.runner is not None:
+            return  # la colonie est utilisée par un autre thread
         if not self.first_composition_done:
             self.civ.reset_ants()
             self.first_composition_done = True
@@ -494,13 +612,15 @@ class BaseCanvas(QOpenGLWidget):
             beta = float(self.beta_input.text())
             self.civ.create_ant_colony(colony_size, alpha, beta)
             for ant in self.civ.get_ants():
-                if ant.get_personalised_color() == None:
-                    ant.set_color(self.selected_color)
+                if self.ant_palette.get_personalised_color(ant) is None:
+                    self.ant_palette.set_color(ant, self.selected_color)
         except ValueError:
             self.result_label.setText("Veuillez entrer des valeurs valides")
 
     def start_animation_after_composition(self):
         """Réinitialise les paramètres d'animation et démarre la simulation."""
+        if self.ga_worker is not None or self.runner is not None:
+            return
         self.ants = self.civ.get_ants()
         colony_size = len(self.ants)
         new_initial_pheromone = colony_size / 1000
@@ -508,15 +628,9 @@ class BaseCanvas(QOpenGLWidget):
         for road in self.civ.get_roads():
             road.reset_pheromone(self.civ.get_initial_pheromone())
         self.civ.steps = 0
-        self.ant_progress = {ant: 0.0 for ant in self.ants}
-        self.start_time = time.time()
         self.last_update = time.time()
-        self.ant_launch_delta = self.ant_speed * 0.04
-        self.ant_launch_time = {
-            ant: self.start_time + i * self.ant_launch_delta
-            for i, ant in enumerate(self.ants)
-        }
         self.civ.step()
+        self.restart_ant_layer()
         self.best_path_text = "Chemin Optimal: N/A"
         self.cached_layout = None
 
@@ -529,37 +643,133 @@ class BaseCanvas(QOpenGLWidget):
         dt = now - self.last_update
         self.last_update = now
 
-        all_finished = True
-        for ant in self.ants:
-            if now < self.ant_launch_time[ant]:
-                all_finished = False
-                continue
-            progress = self.ant_progress[ant] + ant.get_speed() * dt * self.ant_speed
-            if progress >= 1.0:
-                self.ant_progress[ant] = 1.0
-            else:
-                self.ant_progress[ant] = progress
-                all_finished = False
-
-        if all_finished:
+        all_finished = self.ant_layer.advance(now, dt, self.ant_speed)
+        if self.runner is not None:
+            pass  # le moteur tourne dans son thread, voir on_snapshot
+        elif self.steps_per_frame > 0:
+            for _ in range(self.steps_per_frame):
+                self.civ.step()
+            self.update_best_path()
+            self.restart_ant_layer(launch_delta=0)
+        elif all_finished:
             self.civ.step()
-            best_path = self.civ.get_best_path()  # Renvoie une liste de City
-            if best_path:
-                self.best_path_text = "Chemin Optimal: " + "→".join(
-                    str(city.get_id()) for city in best_path
-                )
-            else:
-                self.best_path_text = "Chemin Optimal: N/A"
-            for ant in self.ants:
-                self.ant_progress[ant] = 0.0
-            self.start_time = time.time()
-            self.ant_launch_time = {
-                ant: self.start_time + i * self.ant_launch_delta
-                for i, ant in enumerate(self.ants)
-            }
+            self.update_best_path()
+            self.restart_ant_layer()
 
         self.update()
 
+    def restart_ant_layer(self, launch_delta=None):
+        """
+        Remet à zéro l'avancement des fourmis de self.ants, relance leurs
+        départs échelonnés (toutes les launch_delta secondes) et relit leurs
+        villes après un step, ou dans le dernier relevé du SimulationRunner.
+        """
+        self.start_time = time.time()
+        if launch_delta is None:
+            # Échelonnement des départs limité à 2 s pour les grandes colonies
+            launch_delta = min(self.ant_speed * 0.04, 2 / max(len(self.ants), 1))
+        self.ant_launch_delta = launch_delta
+        self.ant_layer.restart(self.ants, self.start_time, self.ant_launch_delta)
+        self.ant_layer.sync(
+            self.civ.get_cities(),
+            lambda ant: self.ant_palette.get_color(ant).getRgbF(),
+            self.snapshot,
+        )
+        step_counter = getattr(self.parent(), "step_counter", None)
+        if step_counter:
+            steps = self.civ.steps if self.snapshot is None else self.snapshot["steps"]
+            step_counter.setText(f"Step: {steps}")
+
+    def update_best_path(self):
+        """Relit le meilleur chemin de la civilisation."""
+        best_path = self.civ.get_best_path()  # Renvoie une liste de City
+        self.set_best_path([city.get_id() for city in best_path] if best_path else None)
+
+    def set_best_path(self, city_ids):
+        """Met à jour best_path_text (None ou liste vide : pas de chemin)."""
+        if city_ids:
+            self.best_path_text = "Chemin Optimal: " + "→".join(map(str, city_ids))
+        else:
+            self.best_path_text = "Chemin Optimal: N/A"
+
+    def set_steps_per_frame(self, steps_per_frame):
+        """
+        Nombre de steps lancés à chaque image (0 : un step quand toutes les
+        fourmis ont fini leur route, comme avant).
+        """
+        self.steps_per_frame = steps_per_frame
+
+    def set_background_run(self, enabled):
+        """Lance ou arrête la simulation en continu dans un SimulationRunner."""
+        self.background_run = enabled
+        if enabled and self.runner is None:
+            self.start_simulation_runner(None)
+        elif not enabled and self.runner is not None:
+            if self.runner.get_target_step() is None:
+                self.stop_simulation_runner()
+
+    def fast_forward(self, target_step):
+        """Fait tourner le moteur sans animation jusqu'au step target_step."""
+        if self.ga_worker is not None:
+            return
+        # Pendant que le moteur tourne, seul son relevé est lu
+        steps = self.civ.steps if self.runner is None else self.snapshot["steps"]
+        if target_step <= steps:
+            return
+        if self.runner is not None:
+            self.runner.set_target_step(target_step)
+        else:
+            self.start_simulation_runner(target_step)
+
+    def start_simulation_runner(self, target_step):
+        if self.ga_worker is not None:
+            return
+        # Le relevé couvre toutes les fourmis que le moteur fait avancer
+        self.ants = self.civ.get_ants()
+        # Premier relevé pris avant le démarrage du thread : tant que le
+        # moteur tourne, le canvas ne lit plus la civilisation (hors graphe)
+        index = {city: i for i, city in enumerate(self.civ.get_cities())}
+        self.snapshot = take_snapshot(self.civ, index)
+        self.runner = SimulationRunner(self.civ, target_step, parent=self)
+        self.runner.snapshot.connect(self.on_snapshot)
+        self.runner.failed.connect(self.on_runner_failed)
+        self.runner.finished.connect(self.on_runner_finished)
+        self.runner.start()
+
+    def stop_simulation_runner(self):
+        """Arrête le SimulationRunner en cours et attend la fin de son step."""
+        if self.runner is not None:
+            self.runner.stop()
+            self.runner.wait()
+
+    def on_snapshot(self, snapshot):
+        """Affiche le dernier relevé du moteur (le canvas interpole les fourmis)."""
+        self.snapshot = snapshot
+        self.set_best_path(snapshot["best_path"])
+        self.restart_ant_layer(launch_delta=0)
+
+    def on_runner_failed(self, message):
+        print(f"Erreur lors de la simulation: {message}")
+        self.background_run = False
+
+    def on_runner_finished(self):
+        """Le moteur revient au thread de l'interface (ou repart en continu)."""
+        runner = self.sender()
+        runner.deleteLater()
+        if runner is not self.runner:
+            return
+        self.runner = None
+        self.snapshot = None
+        self.restart_ant_layer()
+        # Fin d'une avance rapide : reprendre la simulation en continu
+        if self.background_run and runner.get_target_step() is not None:
+            self.start_simulation_runner(None)
+
+    def initializeGL(self):
+        """Prépare le rendu OpenGL des routes et des fourmis (QPainter sinon)."""
+        renderer = GraphRenderer()
+        self.renderer = renderer if renderer.initialize(self.context()) else None
+
     def paintGL(self):
         """Méthode commune de rendu (dessin des routes, villes, fourmis et textes)."""
         painter = QPainter(self)
@@ -580,88 +790,108 @@ class BaseCanvas(QOpenGLWidget):
             pos = node_positions[city]
             node_positions[city] = QPointF(pos.x() - offset_x, pos.y() - offset_y)
 
-        # Dessin des routes
-        edge_pen = QPen(QColor(255, 255, 255))
-        edge_pen.setWidth(2)
-        painter.setPen(edge_pen)
+        # Intensité de phéromone de chaque route, entre 0 et 1 ; le relevé
+        # existe toujours quand le SimulationRunner tourne
         roads = self.civ.get_roads()
-        max_pheromone = max((road.get_pheromone() for road in roads), default=0)
-        texts_to_draw = []
-        for road in roads:
-            start_city, end_city = road.get_cities()
-            start = node_positions[start_city]
-            end = node_positions[end_city]
-            ratio = road.get_pheromone() / max_pheromone if max_pheromone > 0 else 0
-            thickness = 2 + ratio * 8
-            r = int((1 - ratio) * 255 + ratio * 37)
-            g = int((1 - ratio) * 255 + ratio * 110)
-            b = int((1 - ratio) * 255 + ratio * 255)
-            road_color = QColor(r, g, b)
-            road_pen = QPen(road_color, thickness, Qt.SolidLine)
-            painter.setPen(road_pen)
-            painter.drawLine(start, end)
-
-            # Dessin de la flèche indiquant le sens de la route
-            road_pen = QPen(Qt.white, 2, Qt.SolidLine)
-            painter.setPen(road_pen)
-            middle = QPointF((start.x() + end.x()) / 2, (start.y() + end.y()) / 2)
-            dx = end.x() - start.x()
-            dy = end.y() - start.y()
-            angle = math.atan2(dy, dx)
-            arrow_size = 30
-            arrow_angle = math.radians(30)
-            arrow_p1 = QPointF(
-                middle.x() - arrow_size * math.cos(angle - arrow_angle),
-                middle.y() - arrow_size * math.sin(angle - arrow_angle),
-            )
-            arrow_p2 = QPointF(
-                middle.x() - arrow_size * math.cos(angle + arrow_angle),
-                middle.y() - arrow_size * math.sin(angle + arrow_angle),
+        if self.snapshot is not None:
+            pheromones = self.snapshot["pheromones"]
+        else:
+            pheromones = np.fromiter(
+                (road.get_pheromone() for road in roads), dtype=float, count=len(roads)
             )
-            arrow_head = QPolygonF([middle, arrow_p1, arrow_p2])
-            painter.setBrush(QBrush(Qt.white, Qt.SolidPattern))
-            painter.setPen(QPen(road_color, 4))
-            painter.drawPolygon(arrow_head)
-
-            # Préparation du texte (poids de la route et phéromone)
-            if self.show_road_text:
-                mid_point = QPointF(
-                    (start.x() + end.x()) / 2, (start.y() + end.y()) / 2
+        max_pheromone = pheromones.max(initial=0)
+        if max_pheromone > 0:
+            ratios = pheromones / max_pheromone
+        else:
+            ratios = np.zeros(len(roads))
+
+        # Position et couleur des fourmis, ou carte de densité si elles sont
+        # trop nombreuses
+        ant_radius = 8
+        dense = self.ant_layer.is_dense()
+        half_cell = self.ant_layer.get_cell_size() / 2
+        ant_centers, ant_colors = np.zeros((0, 2)), np.zeros((0, 4))
+        if self.ready_to_go():
+            city_positions = np.array(
+                [
+                    (node_positions[city].x(), node_positions[city].y())
+                    for city in self.civ.get_cities()
+                ]
+            ).reshape(-1, 2)
+            ant_centers, ant_colors = self.ant_layer.positions(city_positions)
+            if dense:
+                ant_centers, ant_colors = self.ant_layer.density(ant_centers)
+
+        # Dessin des routes et des fourmis
+        if self.renderer is not None:
+            painter.beginNativePainting()
+            origin = (offset_x, offset_y)
+            self.renderer.set_graph(self.civ.get_cities(), roads, node_positions)
+            self.renderer.draw_roads(self.width(), self.height(), origin, ratios)
+            if dense:
+                self.renderer.draw_squares(
+                    self.width(),
+                    self.height(),
+                    origin,
+                    ant_centers,
+                    half_cell,
+                    ant_colors,
                 )
-                offset_distance = 25
-                offset_vector = self.calc_perp_offset(
-                    start, end, offset_distance=offset_distance
+            else:
+                self.renderer.draw_discs(
+                    self.width(),
+                    self.height(),
+                    origin,
+                    ant_centers,
+                    ant_radius,
+                    ant_colors,
                 )
-                text_pos = QPointF(
-                    mid_point.x() + offset_vector.x(), mid_point.y() + offset_vector.y()
+            painter.endNativePainting()
+        else:
+            for road, ratio in zip(roads, ratios):
+                start_city, end_city = road.get_cities()
+                start = node_positions[start_city]
+                end = node_positions[end_city]
+                thickness = 2 + ratio * 8
+                r = int((1 - ratio) * 255 + ratio * 37)
+                g = int((1 - ratio) * 255 + ratio * 110)
+                b = int((1 - ratio) * 255 + ratio * 255)
+                road_color = QColor(r, g, b)
+                road_pen = QPen(road_color, thickness, Qt.SolidLine)
+                painter.setPen(road_pen)
+                painter.drawLine(start, end)
+
+                # Dessin de la flèche indiquant le sens de la route
+                road_pen = QPen(Qt.white, 2, Qt.SolidLine)
+                painter.setPen(road_pen)
+                middle = QPointF((start.x() + end.x()) / 2, (start.y() + end.y()) / 2)
+                dx = end.x() - start.x()
+                dy = end.y() - start.y()
+                angle = math.atan2(dy, dx)
+                arrow_size = 30
+                arrow_angle = math.radians(30)
+                arrow_p1 = QPointF(
+                    middle.x() - arrow_size * math.cos(angle - arrow_angle),
+                    middle.y() - arrow_size * math.sin(angle - arrow_angle),
                 )
-                weight_text = str(round(road.get_weight(), 2))
-                pheromone_text = str(round(road.get_pheromone(), 3))
-                text = weight_text + " | " + pheromone_text
-                angle_deg = math.degrees(
-                    math.atan2(end.y() - start.y(), end.x() - start.x())
+                arrow_p2 = QPointF(
+                    middle.x() - arrow_size * math.cos(angle + arrow_angle),
+                    middle.y() - arrow_size * math.sin(angle + arrow_angle),
                 )
-                if angle_deg > 90 or angle_deg < -90:
-                    angle_deg += 180
-                texts_to_draw.append((text_pos, angle_deg, text))
+                arrow_head = QPolygonF([middle, arrow_p1, arrow_p2])
+                painter.setBrush(QBrush(Qt.white, Qt.SolidPattern))
+                painter.setPen(QPen(road_color, 4))
+                painter.drawPolygon(arrow_head)
 
-        # Dessin des fourmis
-        if self.ready_to_go():
-            ant_radius = 8
-            for ant in self.ants:
-                u = ant.get_current_city()
-                v = ant.get_next_city()
-                if v is None:
-                    continue
-                start = node_positions[u]
-                end = node_positions[v]
-                t = self.ant_progress[ant]
-                anim_x = (1 - t) * start.x() + t * end.x()
-                anim_y = (1 - t) * start.y() + t * end.y()
-                anim_pos = QPointF(anim_x, anim_y)
-                painter.setBrush(QBrush(ant.get_color()))
-                painter.setPen(Qt.NoPen)
-                painter.drawEllipse(anim_pos, ant_radius, ant_radius)
+            painter.setPen(Qt.NoPen)
+            for (x, y), color in zip(ant_centers, ant_colors):
+                painter.setBrush(QBrush(QColor.fromRgbF(*color)))
+                if dense:
+                    cell = QRectF(0, 0, 2 * half_cell, 2 * half_cell)
+                    cell.moveCenter(QPointF(x, y))
+                    painter.drawRect(cell)
+                else:
+                    painter.drawEllipse(QPointF(x, y), ant_radius, ant_radius)
 
         # Dessin des villes
         radius = 20
@@ -679,36 +909,16 @@ class BaseCanvas(QOpenGLWidget):
             painter.setBrush(QBrush(fill_color))
             painter.setPen(Qt.NoPen)
             painter.drawEllipse(pos, radius, radius)
-            painter.setFont(QFont("Roboto", 16))
-            painter.setPen(QPen(QColor(255, 255, 255)))
-            city_text = str(city.get_id())
-            fm = painter.fontMetrics()
-            text_width = fm.horizontalAdvance(city_text)
-            text_height = fm.height()
-            painter.drawText(
-                int(pos.x() - text_width / 2),
-                int(pos.y() - text_height / 2),
-                text_width,
-                text_height,
-                Qt.AlignCenter,
-                city_text,
-            )
+        self.label_cache.draw_city_ids(painter, node_positions)
 
         # Affichage du meilleur chemin
         self.display_best_path_window()
 
         # Affichage des textes sur les routes
-        painter.setFont(QFont("Roboto", 14))
-        painter.setPen(QPen(QColor(255, 255, 255)))
-        for text_pos, angle_deg, text in texts_to_draw:
-            painter.save()
-            painter.translate(text_pos)
-            painter.rotate(angle_deg)
-            fm = painter.fontMetrics()
-            text_width = fm.horizontalAdvance(text)
-            text_height = fm.height()
-            painter.drawText(int(-text_width / 2), int(text_height / 2), text)
-            painter.restore()
+        if self.show_road_text:
+            self.label_cache.draw_road_labels(
+                painter, roads, pheromones, node_positions
+            )
 
         painter.end()
 
@@ -742,18 +952,6 @@ class BaseCanvas(QOpenGLWidget):
     def ready_to_go(self):
         return self.ant_speed > 0
 
-    def calc_perp_offset(
-        self, start: QPointF, end: QPointF, offset_distance=10
-    ) -> QPointF:
-        dx = end.x() - start.x()
-        dy = end.y() - start.y()
-        mag = math.sqrt(dx**2 + dy**2)
-        if mag == 0:
-            return QPointF(0, 0)
-        offset_x = -dy / mag * offset_distance
-        offset_y = dx / mag * offset_distance
-        return QPointF(offset_x, offset_y)
-
     def setAntSpeed(self, speed):
         self.ant_speed = speed
 
@@ -762,159 +960,96 @@ class BaseCanvas(QOpenGLWidget):
         self.update()
 
     def launch_genetic_algorithm(self):
-        """Lance l'algorithme génétique de la civilisation et affiche les résultats."""
-        try:
-            # Récupérer les éléments d'interface depuis le parent
-            parent = self.parent()
-            if hasattr(parent, "iteration_counter"):
-                iteration_label = parent.iteration_counter
-            else:
-                iteration_label = None
-
-            if hasattr(parent, "results_area"):
-                results_area = parent.results_area
-            else:
-                results_area = None
-
-            if hasattr(parent, "genetic_button"):
-                genetic_button = parent.genetic_button
+        """
+        Lance l'algorithme génétique dans un GeneticAlgorithmWorker, ou
+        l'annule s'il est déjà en cours. La fenêtre reste réactive : le
+        thread travaille sur une copie de la civilisation, substituée à
+        celle du canvas à la fin du calcul.
+        """
+        genetic_button = getattr(self.parent(), "genetic_button", None)
+        if self.ga_worker is not None:
+            self.ga_worker.cancel()
+            if genetic_button:
                 genetic_button.setEnabled(False)
-                genetic_button.setText("Exécution en cours...")
-            else:
-                genetic_button = None
-
-            # Stopper l'animation des fourmis pendant l'exécution de l'algorithme génétique
-            self.timer.stop()
-
-            # Modifier la méthode genetic_algo_application pour mettre à jour le compteur
-            original_genetic_algo = self.civ.genetic_algo_application
-
-            def modified_genetic_algo(nb_iteration=100):
-                # Stocker les valeurs de threshold_genetic_algo initiales
-                threshold_initial = self.civ._Civilization__threshold_genetic_algo
-
-                # Exécuter nb_iteration fois step()
-                for _ in range(nb_iteration):
-                    self.civ.step()
-                    best_path_has_changed = False
-
-                    if self.best_path is None:
-                        self.best_path = self.civ.get_best_path()
-                    else:
-                        new_best_path = self.civ.get_best_path()
-                        for i in range(len(new_best_path)):
-                            if new_best_path[i].get_id() != self.best_path[i].get_id():
-                                best_path_has_changed = True
-                                self.step_without_change = 0
-                                self.best_path = new_best_path
-                                break
-
-                    if not best_path_has_changed:
-                        self.step_without_change += 1
-
-                    if not best_path_has_changed and self.step_without_change == 20:
-                        print("CONVERGENCE ATTEINTE :", self.civ.steps - 20)
-
-                    if best_path_has_changed:
-                        self.best_path = new_best_path
-
-                # Boucle principale de l'algorithme génétique
-                threshold_genetic_algo = threshold_initial
-                convergence_times = []
-                while threshold_genetic_algo > 0:
-                    fake_step = 0
-                    # Mettre à jour le label d'itération
-                    if iteration_label:
-                        iteration_label.setText(
-                            f"Itérations restantes: {threshold_genetic_algo}"
-                        )
-                        iteration_label.repaint()
-
-                    # Exécuter l'algorithme génétique
-                    self.civ.genetic_algo()
-
-                    # Mettre à jour le dictionnaire ant_progress avec les nouvelles fourmis
-                    current_ants = self.civ.get_ants()
-                    self.ants = current_ants
-                    # Mettre à jour le ant_progress en ajoutant les fourmis manquantes
-                    for ant in current_ants:
-                        if ant not in self.ant_progress:
-                            self.ant_progress[ant] = 0.0
-
-                    # Réinitialiser les fourmis
-                    for ant in self.civ.get_ants():
-                        ant.reset_ant()
-
-                    # Reset les phéromones
-                    for road in self.civ.get_roads():
-                        road.reset_pheromone(self.civ.get_initial_pheromone())
-
-                    self.best_path = None
-
-                    # Exécuter nb_iteration fois step()
-                    for iter in range(nb_iteration):
-                        self.civ.step()
-                        fake_step += 1
-                        best_path_has_changed = False
-
-                        if self.best_path is None:
-                            self.best_path = self.civ.get_best_path()
-                        else:
-                            new_best_path = self.civ.get_best_path()
-                            for i in range(len(new_best_path)):
-                                if (
-                                    new_best_path[i].get_id()
-                                    != self.best_path[i].get_id()
-                                ):
-                                    best_path_has_changed = True
-                                    self.step_without_change = 0
-                                    self.best_path = new_best_path
-                                    break
-
-                        if not best_path_has_changed:
-                            self.step_without_change += 1
-
-                        if not best_path_has_changed and self.step_without_change == 20:
-                            convergence_times.append(fake_step)
-                            print("CONVERGENCE ATTEINTE :", fake_step - 20)
-
-                        if best_path_has_changed:
-                            self.best_path = new_best_path
-
-                    threshold_genetic_algo -= 1
-
-                self.plot_convergence_times(convergence_times)
-
-                # Afficher les résultats
-                self.display_results(results_area)
-
-                # Réactiver le bouton
-                if genetic_button:
-                    genetic_button.setEnabled(True)
-                    genetic_button.setText("Lancer Algo. Génétique")
-
-                # Redémarrer l'animation
-                self.timer.start()
-
-            # Remplacer temporairement la méthode
-            self.civ.genetic_algo_application = modified_genetic_algo
-
-            # Lancer l'algorithme
-            self.civ.genetic_algo_application((100))
-
-            # Restaurer la méthode originale
-            self.civ.genetic_algo_application = original_genetic_algo
+                genetic_button.setText("Annulation...")
+            return
+
+        # Le moteur doit être revenu au thread de l'interface avant la copie
+        background_checkbox = getattr(self.parent(), "background_checkbox", None)
+        if background_checkbox:
+            background_checkbox.setChecked(False)
+        self.background_run = False
+        self.stop_simulation_runner()
+
+        # Stopper l'animation des fourmis pendant l'exécution de l'algorithme génétique
+        self.timer.stop()
+
+        self.ga_worker = GeneticAlgorithmWorker(self.civ, 100, self)
+        self.ga_worker.progress.connect(self.on_genetic_progress)
+        self.ga_worker.completed.connect(self.on_genetic_completed)
+        self.ga_worker.cancelled.connect(self.on_genetic_cancelled)
+        self.ga_worker.failed.connect(self.on_genetic_failed)
+        self.ga_worker.finished.connect(self.on_genetic_finished)
+
+        if genetic_button:
+            genetic_button.setText("■ Annuler l'Algorithme")
+        self.ga_worker.start()
+
+    def stop_genetic_algorithm(self):
+        """Annule l'algorithme génétique en cours et attend la fin du thread."""
+        if self.ga_worker is not None:
+            self.ga_worker.cancel()
+            self.ga_worker.wait()
+
+    def on_genetic_progress(self, generation, generations):
+        iteration_label = getattr(self.parent(), "iteration_counter", None)
+        if iteration_label:
+            iteration_label.setText(
+                f"Itérations restantes: {generations - generation}"
+            )
 
-        except Exception as e:
-            print(f"Erreur lors de l'exécution de l'algorithme génétique: {e}")
-            import traceback
+    def on_genetic_completed(self, civ):
+        """Remplace d'un bloc la civilisation affichée par celle du thread."""
+        # Les fourmis sont recréées : reporter les couleurs choisies par id
+        colors = {
+            ant.get_id(): self.ant_palette.get_personalised_color(ant)
+            for ant in self.civ.get_ants()
+        }
+        for ant in civ.get_ants():
+            if colors.get(ant.get_id()) is not None:
+                self.ant_palette.set_color(ant, colors[ant.get_id()])
 
-            traceback.print_exc()
-            # S'assurer que le timer est redémarré en cas d'erreur
-            self.timer.start()
-            if hasattr(self.parent(), "genetic_button"):
-                self.parent().genetic_button.setEnabled(True)
-                self.parent().genetic_button.setText("Lancer Algo. Génétique")
+        self.civ = civ
+        self.cached_layout = None
+        self.best_path = civ.get_best_path()
+        self.plot_convergence_times(self.ga_worker.get_convergence_times())
+
+        # Afficher les résultats
+        self.display_results(getattr(self.parent(), "results_area", None))
+
+    def on_genetic_cancelled(self):
+        iteration_label = getattr(self.parent(), "iteration_counter", None)
+        if iteration_label:
+            iteration_label.setText("Algorithme annulé")
+
+    def on_genetic_failed(self, message):
+        print(f"Erreur lors de l'exécution de l'algorithme génétique: {message}")
+        iteration_label = getattr(self.parent(), "iteration_counter", None)
+        if iteration_label:
+            iteration_label.setText("Erreur de l'algorithme")
+
+    def on_genetic_finished(self):
+        """Fin du thread (terminé, annulé ou en erreur) : réactiver l'interface."""
+        self.ga_worker.deleteLater()
+        self.ga_worker = None
+        genetic_button = getattr(self.parent(), "genetic_button", None)
+        if genetic_button:
+            genetic_button.setEnabled(True)
+            genetic_button.setText("▶ Lancer l'Algorithme")
+
+        # Redémarrer l'animation
+        self.last_update = time.time()
+        self.timer.start()
 
     def display_results(self, results_area=None):
         """Affiche les résultats de l'algorithme génétique."""
@@ -962,21 +1097,10 @@ class BaseCanvas(QOpenGLWidget):
                 parent.iteration_counter.setText("Algorithme terminé!")
                 parent.iteration_counter.setAlignment(Qt.AlignCenter)
 
-            # Réinitialiser l'animation
-            self.start_time = time.time()
+            # Réinitialiser l'animation avec les fourmis de la civilisation
             self.last_update = time.time()
-
-            # S'assurer que toutes les fourmis sont dans le dictionnaire ant_progress
-            current_ants = self.civ.get_ants()
-            self.ants = current_ants
-            self.ant_progress = {ant: 0.0 for ant in current_ants}
-
-            # Recalculer les temps de lancement
-            self.ant_launch_delta = self.ant_speed * 0.04
-            self.ant_launch_time = {
-                ant: self.start_time + i * self.ant_launch_delta
-                for i, ant in enumerate(self.ants)
-            }
+            self.ants = self.civ.get_ants()
+            self.restart_ant_layer()
 
             self.update()
 
@@ -987,7 +1111,8 @@ class BaseCanvas(QOpenGLWidget):
             traceback.print_exc()
 
     def plot_convergence_times(self, convergence_times):
-        nb_data = self.civ.get_threshold_genetic_algo()
+        # Une génération sans convergence n'ajoute pas de temps
+        nb_data = min(self.civ.get_threshold_genetic_algo(), len(convergence_times))
         plt.plot([i for i in range(nb_data)], convergence_times[:nb_data])
         plt.xlabel("Génération")
         plt.ylabel("Nombre de steps avant convergence")
@@ -1038,6 +1163,8 @@ class SimulationCanvas(BaseCanvas):
         return node_positions
 
     def mousePressEvent(self, event):
+        if self.ga_worker is not None or self.runner is not None:
+            return  # le graphe est utilisé par un autre thread
         if event.button() == Qt.LeftButton:
             pos = event.pos()
             # Si aucune ville n'est proche, en créer une nouvelle
@@ -1081,3 +1208,11 @@ class SimulationCanvas(BaseCanvas):
             ):
                 return city
         return None
+
+
+def main_pcc(civ, edition_mode):
+    app = QApplication(sys.argv)
+    window = Visualizer(civ, edition_mode)
+    window.showMaximized()
+
+    sys.exit(app.exec_())
@@ -1,6 +1,11 @@
 import random
 
-from PyQt5.QtGui import QColor
+import numpy as np
+
+
+def extend_signature(signature: int, road_id) -> int:
+    """Hachage glissant d'un chemin : signature du préfixe prolongé d'une route."""
+    return hash((signature, road_id))
 
 
 class Ant:
@@ -13,34 +18,20 @@ class Ant:
         self.__current_city = start_city
         self.__next_city = None
         self.__speed = 1.0
-        self.__color_no_food = QColor(100, random.randint(240, 255), 100)
-        self.__color_with_food = QColor(
-            random.randint(150, 230), random.randint(90, 120), 10
-        )
         self.__explored_roads = []
+        # Signatures des préfixes du chemin en cours (pile parallèle aux routes)
+        self.__path_signatures = [0]
         self.__cumulated_weights = 0
         self.__food_quantity = 0
-        self.__explored_roads_count = {}
+        self.__explored_roads_count = {}  # signature du chemin -> passages
         self.__q0 = 0.25
         self.__visited_cities = []
-        self.__color = None
+        # Un octet par identifiant de ville : test d'appartenance en O(1)
+        self.__visited_mask = bytearray()
 
     def get_id(self):
         return self.__id
 
-    def get_color(self):
-        if self.__has_food:
-            return self.__color_with_food
-        else:
-            return self.__color_no_food
-
-    def get_personalised_color(self):
-        return self.__color
-
-    def set_color(self, color):
-        self.__color_no_food = color
-        self.__color = color
-
     def get_speed(self):
         return self.__speed
 
@@ -51,6 +42,13 @@ class Ant:
     def get_parameters(self):
         return self.__alpha, self.__beta
 
+    def get_q0(self):
+        return self.__q0
+
+    def set_q0(self, q0: float):
+        assert 0 <= q0 <= 1
+        self.__q0 = q0
+
     def get_food_quantity(self):
         return self.__food_quantity
 
@@ -75,9 +73,21 @@ class Ant:
 
     def add_visited_cities(self, city):
         self.__visited_cities.append(city)
+        city_id = city.get_id()
+        if city_id >= len(self.__visited_mask):
+            self.__visited_mask.extend(bytes(city_id + 1 - len(self.__visited_mask)))
+        self.__visited_mask[city_id] = 1
+
+    def get_visited_mask(self):
+        return self.__visited_mask
+
+    def has_visited(self, city):
+        city_id = city.get_id()
+        return city_id < len(self.__visited_mask) and self.__visited_mask[city_id] == 1
 
     def reset_visited_cities(self):
         self.__visited_cities = []
+        self.__visited_mask = bytearray()
 
     def get_exploration_fitness(self):
         return len(self.__explored_roads_count)
@@ -86,10 +96,12 @@ class Ant:
         self.__current_city = self.__start_city
         self.__next_city = None
         self.__explored_roads = []
+        self.__path_signatures = [0]
         self.__cumulated_weights = 0
         self.__food_quantity = 0
         self.__explored_roads_count = {}
         self.__has_food = False
+        self.reset_visited_cities()
 
     def get_next_city(self):
         return self.__next_city
@@ -100,6 +112,9 @@ class Ant:
 
     def add_explored_road(self, road):
         self.__explored_roads.append(road)
+        self.__path_signatures.append(
+            extend_signature(self.__path_signatures[-1], road.get_id())
+        )
         return
 
     def get_explored_roads(self):
@@ -112,11 +127,23 @@ class Ant:
         self.__explored_roads_count[road] = 0
 
     def pop_explored_roads(self):
-        self.__explored_roads.pop()
-        return
+        self.__path_signatures.pop()
+        return self.__explored_roads.pop()
+
+    def get_path_signature(self):
+        return self.__path_signatures[-1]
+
+    def register_explored_path(self, signature=None):
+        """Comptabilise le chemin en cours (ou la signature donnée) en O(1)."""
+        if signature is None:
+            signature = self.__path_signatures[-1]
+        self.__explored_roads_count[signature] = (
+            self.__explored_roads_count.get(signature, 0) + 1
+        )
 
     def reset_explored_roads(self):
         self.__explored_roads = []
+        self.__path_signatures = [0]
 
     def has_food(self):
         return self.__has_food
@@ -131,6 +158,11 @@ class Ant:
     def set_food_quantity(self):
         self.__food_quantity += 1
 
+    def load_fitness(self, food_quantity: int, explored_roads_count: dict):
+        """Reprend une fitness évaluée ailleurs (par exemple dans un processus)."""
+        self.__food_quantity = food_quantity
+        self.__explored_roads_count = dict(explored_roads_count)
+
     def take_food(self):
         pass
 
@@ -153,9 +185,8 @@ class Ant:
             for road in roads
         ]
         total_weights = sum(weights)
-        probabilities = [w / total_weights for w in weights]
         q = random.uniform(0, 1)
-        if sum(weights) == 0:
+        if total_weights == 0:
             return random.choice(roads)
         if q <= self.__q0:
             # Exploitation : sélection de la route avec le poids maximal
@@ -167,7 +198,26 @@ class Ant:
 
         else:
             # Exploration : sélection d'une route selon les probabilités
-            return random.choices(roads, weights=probabilities, k=1)[0]
+            return random.choices(roads, weights=weights, k=1)[0]
+
+    def weighted_choice_matrix(self, roads, pheromones, weights):
+        """
+        Variante vectorisée de weighted_choice : pheromones et weights sont des
+        tableaux numpy alignés sur roads (lus dans une PheromoneMatrix).
+        """
+        eta = 1 / weights
+        attractiveness = pheromones**self.__alpha * eta**self.__beta
+        total_weights = attractiveness.sum()
+        q = random.uniform(0, 1)
+        if total_weights == 0:
+            return random.choice(roads)
+        if q <= self.__q0:
+            # Exploitation : sélection de la route avec le poids maximal
+            return roads[int(np.argmax(pheromones * eta**self.__beta))]
+        # Exploration : tirage par roulette sur les probabilités cumulées
+        cumulated = np.cumsum(attractiveness)
+        index = np.searchsorted(cumulated, random.random() * total_weights, "right")
+        return roads[min(int(index), len(roads) - 1)]
 
     def mutation(self):
         parameter_to_mutate = random.choice(["alpha", "beta"])
@@ -0,0 +1,131 @@
+import numpy as np
+
+# Couleur des cases de la vue de densité, de la moins à la plus peuplée (rgba)
+SPARSE_COLOR = np.array([1.0, 0.95, 0.3, 0.35])
+DENSE_COLOR = np.array([1.0, 0.25, 0.05, 0.9])
+
+
+class AntLayer:
+    """
+    État d'animation des fourmis du visualiseur sous forme de tableaux
+    (une ligne par fourmi) : ville courante, ville suivante, vitesse,
+    couleur, heure de départ et avancement sur la route. Les villes et les
+    couleurs sont relues dans les fourmis après chaque step (sync) ; entre
+    deux steps, l'avancement et les positions interpolées sont calculés en
+    une seule opération numpy par image.
+    Au-delà de density_threshold fourmis, le canvas affiche une carte de
+    densité (cases de cell_size pixels) plutôt qu'un disque par fourmi.
+    """
+
+    def __init__(self, density_threshold: int = 2000, cell_size: float = 16):
+        assert density_threshold > 0 and cell_size > 0
+        self.__density_threshold = density_threshold
+        self.__cell_size = cell_size
+        self.__ants = []
+        self.__current = np.zeros(0, dtype=int)  # indice de la ville courante
+        self.__next = np.zeros(0, dtype=int)  # ville suivante, -1 si aucune
+        self.__speeds = np.zeros(0)
+        self.__colors = np.zeros((0, 4))
+        self.__launch_times = np.zeros(0)
+        self.__progress = np.zeros(0)
+
+    def get_ants(self):
+        return self.__ants
+
+    def get_density_threshold(self):
+        return self.__density_threshold
+
+    def set_density_threshold(self, density_threshold: int):
+        assert density_threshold > 0
+        self.__density_threshold = density_threshold
+
+    def get_cell_size(self):
+        return self.__cell_size
+
+    def is_dense(self):
+        """Vrai si la colonie est trop grande pour dessiner chaque fourmi."""
+        return len(self.__ants) > self.__density_threshold
+
+    def restart(self, ants, start_time: float, launch_delta: float):
+        """
+        Repart de zéro (avancement nul) avec les fourmis ants, lancées l'une
+        après l'autre toutes les launch_delta secondes depuis start_time.
+        """
+        self.__ants = list(ants)
+        self.__launch_times = start_time + np.arange(len(self.__ants)) * launch_delta
+        self.__progress = np.zeros(len(self.__ants))
+
+    def sync(self, cities, color_of, snapshot=None):
+        """
+        Relit la ville courante, la ville suivante, la vitesse et la couleur
+        (color_of(fourmi) -> rgba entre 0 et 1) de chaque fourmi. Les villes
+        sont prises dans snapshot (voir take_snapshot) s'il est donné.
+        """
+        m = len(self.__ants)
+        if snapshot is not None:
+            self.__current = snapshot["current"]
+            self.__next = snapshot["next"]
+        else:
+            index = {city: i for i, city in enumerate(cities)}
+            self.__current = np.fromiter(
+                (index[ant.get_current_city()] for ant in self.__ants),
+                dtype=int,
+                count=m,
+            )
+            self.__next = np.fromiter(
+                (
+                    -1 if ant.get_next_city() is None else index[ant.get_next_city()]
+                    for ant in self.__ants
+                ),
+                dtype=int,
+                count=m,
+            )
+        self.__speeds = np.fromiter(
+            (ant.get_speed() for ant in self.__ants), dtype=float, count=m
+        )
+        self.__colors = np.array(
+            [color_of(ant) for ant in self.__ants], dtype=float
+        ).reshape(-1, 4)
+
+    def advance(self, now: float, dt: float, ant_speed: float):
+        """
+        Fait avancer les fourmis déjà lancées. Retourne True quand toutes
+        les fourmis sont lancées et arrivées au bout de leur route.
+        """
+        launched = now >= self.__launch_times
+        progress = self.__progress + self.__speeds * dt * ant_speed
+        self.__progress = np.where(launched, np.minimum(progress, 1.0), self.__progress)
+        return bool(launched.all() and (self.__progress >= 1.0).all())
+
+    def positions(self, city_positions):
+        """
+        Positions interpolées (fourmis x 2) et couleurs (fourmis x 4) des
+        fourmis en chemin, city_positions étant le tableau (villes x 2) des
+        positions des villes dans l'ordre de sync.
+        """
+        moving = self.__next >= 0
+        t = self.__progress[moving, None]
+        start = city_positions[self.__current[moving]]
+        end = city_positions[self.__next[moving]]
+        return (1 - t) * start + t * end, self.__colors[moving]
+
+    def density(self, centers):
+        """
+        Carte de densité des positions centers : centres des cases occupées
+        (cases x 2) et couleur de chaque case, selon le logarithme du nombre
+        de fourmis qu'elle contient.
+        """
+        if len(centers) == 0:
+            return np.zeros((0, 2)), np.zeros((0, 4))
+        cells = np.floor(centers / self.__cell_size).astype(np.int64)
+        # Une clé entière par case : np.unique est bien plus rapide en 1D
+        low = cells.min(axis=0)
+        cells -= low
+        columns = cells[:, 1].max() + 1
+        keys, counts = np.unique(
+            cells[:, 0] * columns + cells[:, 1], return_counts=True
+        )
+        cells = np.column_stack(np.divmod(keys, columns)) + low
+        level = np.log1p(counts) / np.log1p(counts.max())
+        colors = (1 - level[:, None]) * SPARSE_COLOR + level[:, None] * DENSE_COLOR
+        return (cells + 0.5) * self.__cell_size, colors
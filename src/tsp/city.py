@@ -2,6 +2,7 @@ class City:
     def __init__(self, id: int, position=None):
         self.__id = id
         self.__outgoing_roads = []
+        self.__candidate_roads = []  # routes vers les k plus proches voisines
         self.__position = position
 
     def get_id(self):
@@ -21,6 +22,12 @@ class City:
         self.__outgoing_roads.append(road)
         return
 
+    def get_candidate_roads(self):
+        return self.__candidate_roads
+
+    def set_candidate_roads(self, roads):
+        self.__candidate_roads = roads
+
     def get_neighbors(self):
         return [
             (
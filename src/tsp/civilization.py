@@ -3,10 +3,30 @@ import random
 import matplotlib.pyplot as plt
 import numpy as np
 from sklearn.manifold import MDS
+from sklearn.neighbors import NearestNeighbors
 
-from tsp.ant import Ant
+from tsp.ant import Ant, extend_signature
 from tsp.city import City
-from tsp.road import Road
+from tsp.convergence import ConvergenceMonitor
+from tsp.evaporation import EvaporationClock
+from tsp.local_search import tour_length, two_opt
+from tsp.pheromone_matrix import PheromoneMatrix
+from tsp.pheromone_ranking import PheromoneRanking
+from tsp.profiling import PhaseProfiler
+from tsp.road import MatrixRoad, Road
+from tsp.tour_construction import ColonyTourBuilder
+
+# Nombre de villes à partir duquel le backend "matrix" est plus rapide en mode
+# step. En dessous, le coût fixe des appels numpy sur des tableaux de quelques
+# routes, à chaque choix de fourmi, l'emporte (environ 2,4 fois plus lent à 10
+# villes, à égalité vers 45, 2,8 fois plus rapide à 150). Avec iteration(), le
+# backend "matrix" est plus rapide quelle que soit la taille.
+MATRIX_BACKEND_MIN_CITIES = 50
+
+
+def recommended_backend(nb_cities: int) -> str:
+    """Backend le plus rapide en mode step pour un graphe de nb_cities villes."""
+    return "matrix" if nb_cities >= MATRIX_BACKEND_MIN_CITIES else "objects"
 
 
 class Civilization:
@@ -17,34 +37,76 @@ class Civilization:
         initial_pheromone: float,
         mutation_factor: float,
         steps_genetic_algo: int,
+        backend: str = "objects",
     ):
+        # "objects" : phéromones portées par chaque Road
+        # "matrix" : phéromones et poids dans des matrices numpy (n x n),
+        # voir recommended_backend pour le choix
+        assert backend in ("objects", "matrix")
+        self.__backend = backend
+        self.__store = PheromoneMatrix() if backend == "matrix" else None
+        if self.__store is not None:
+            self.__store.add_city(nest)
         self.__cities = [nest]
         self.__roads = []
+        # Index maintenus par add_city / add_road pour des recherches en O(1)
+        self.__cities_by_id = {nest.get_id(): nest}
+        self.__city_indices = {nest: 0}  # ville -> indice dans get_cities()
+        self.__roads_by_cities = {}
+        # Listes de candidates (villes x k, complétées par -1), voir
+        # build_candidate_lists
+        self.__candidates = None
+        # Recherche locale 2-opt avant dépôt : None, "all" ou "best"
+        self.__local_search = None
+        self.__local_search_matrix = None
+        # MAX-MIN Ant System, voir set_mmas
+        self.__mmas = None
+        self.__mmas_p_best = 0.05
+        self.__mmas_stagnation = 50
+        self.__mmas_bounds = None  # (tau_min, tau_max)
+        self.__mmas_idle_updates = 0  # mises à jour sans amélioration
+        # Ant Colony System, voir set_acs : (q0, xi, tau0) ou None
+        self.__acs = None
+        self.__ant_q0 = 0.25  # q0 donné aux nouvelles fourmis
+        # Meilleur circuit trouvé et meilleur circuit de la dernière itération
+        # (indices de get_cities()), voir get_best_tour
+        self.__best_tour = None
+        self.__best_length = np.inf
+        self.__best_tour_cities = None
+        self.__iteration_best_tour = None
+        self.__iteration_best_length = np.inf
+        self.__iteration_best_tour_cities = None
+        # Chemin glouton de get_best_path, recalculé quand la version change
+        self.__ranking = PheromoneRanking()
+        self.__best_path = None
+        self.__best_path_version = None
+        self.__best_path_ranking = None  # backend "matrix", voir get_best_path
         self.__nest = nest
         self.__ants = []
         self.__half_pheromone_time = int(np.log(1 / 2) / np.log(1 - evaporation_rate))
         self.__evaporation_rate = evaporation_rate
+        # Évaporation paresseuse des Road (backend "objects")
+        self.__evaporation_clock = EvaporationClock(evaporation_rate)
         self.steps = 0
+        self.iterations = 0  # itérations complètes, voir iteration()
         self.__initial_pheromone = initial_pheromone
         self.__scale_factor = 120  # 1 unité de poids correspond à 120 pixels
         self.__mutation_factor = mutation_factor
         self.__threshold_genetic_algo = 150
         self.__steps_genetic_algo = steps_genetic_algo
+        self.__convergence_monitor = None  # arrêt anticipé des générations
+        self.__profiler = None  # voir set_profiler
 
     def get_cities(self):
         return self.__cities
 
     def get_city_by_id(self, id: int):
-        for city in self.__cities:
-            if city.get_id() == id:
-                return city
-        return None
+        return self.__cities_by_id.get(id)
 
     def get_road_by_cities(self, start_city, end_city):
-        for road in self.__roads:
-            if road.get_id() == (start_city.get_id(), end_city.get_id()):
-                return road
-        return None
+        # Les routes sont non orientées : la clé est triée comme Road.get_id
+        key = tuple(sorted([start_city.get_id(), end_city.get_id()]))
+        return self.__roads_by_cities.get(key)
 
     def get_roads(self):
         return self.__roads
@@ -64,8 +126,33 @@ class Civilization:
     def get_mutation_factor(self):
         return self.__mutation_factor
 
+    def get_evaporation_rate(self):
+        return self.__evaporation_rate
+
+    def get_steps_genetic_algo(self):
+        return self.__steps_genetic_algo
+
+    def get_threshold_genetic_algo(self):
+        return self.__threshold_genetic_algo
+
+    def get_backend(self):
+        return self.__backend
+
+    def get_pheromone_matrix(self):
+        """Retourne la PheromoneMatrix (None avec le backend "objects")."""
+        return self.__store
+
     def add_city(self, city: City):
         self.__cities.append(city)
+        self.__cities_by_id[city.get_id()] = city
+        self.__city_indices[city] = len(self.__cities) - 1
+        self.__local_search_matrix = None
+        self.__best_path = None
+        # Le graphe change : les listes de candidates sont à reconstruire
+        if self.__candidates is not None:
+            self.clear_candidate_lists()
+        if self.__store is not None:
+            self.__store.add_city(city)
         return
 
     def set_ants(self, ants):
@@ -77,13 +164,31 @@ class Civilization:
         start_city: City,
         end_city: City,
     ):
-        if start_city.get_id() < end_city.get_id():
-            road = Road(weight, start_city, end_city, self.__initial_pheromone)
+        if start_city.get_id() > end_city.get_id():
+            start_city, end_city = end_city, start_city
+        if self.__store is not None:
+            road = MatrixRoad(
+                weight, start_city, end_city, self.__initial_pheromone, self.__store
+            )
         else:
-            road = Road(weight, end_city, start_city, self.__initial_pheromone)
+            road = Road(
+                weight,
+                start_city,
+                end_city,
+                self.__initial_pheromone,
+                self.__evaporation_clock,
+            )
+            road.set_listener(self.__ranking.road_changed)
         self.__roads.append(road)
+        self.__roads_by_cities[road.get_id()] = road
+        self.__best_path = None
+        self.__local_search_matrix = None
+        if self.__candidates is not None:
+            self.clear_candidate_lists()
         start_city.add_road(road)
         end_city.add_road(road)
+        self.__ranking.forget(start_city)
+        self.__ranking.forget(end_city)
         return
 
     def add_ants(self, ant: Ant):
@@ -92,20 +197,47 @@ class Civilization:
 
     def set_nest(self, nest: City):
         self.__nest = nest
+        self.__best_path = None
         return
 
     def set_initial_pheromone(self, new_initial_pheronome: float):
         self.__initial_pheromone = new_initial_pheronome
 
     def halve_pheromone(self):
+        if self.__store is not None:
+            self.__store.scale(1 / 2)
+            return
+        self.__evaporation_clock.scale(1 / 2)
+
+    def evaporate_pheromone(self):
+        if self.__store is not None:
+            self.__store.evaporate(self.__evaporation_rate)
+            return
+        # Appliquée par chaque route lors de son prochain accès
+        self.__evaporation_clock.tick()
+
+    def reset_pheromones(self, value: float = None):
+        if value is None:
+            # En ACS, les routes repartent de tau0
+            value = self.__initial_pheromone if self.__acs is None else self.__acs[2]
+        if self.__store is not None:
+            self.__store.reset(value)
+            return
+        for road in self.__roads:
+            road.reset_pheromone(value)
+
+    def clamp_pheromones(self, tau_min: float, tau_max: float):
+        if self.__store is not None:
+            self.__store.clamp(tau_min, tau_max)
+            return
         for road in self.__roads:
-            current_pheromone = road.get_pheromone()
-            road.set_pheromone(current_pheromone / 2)
+            road.set_pheromone(min(max(road.get_pheromone(), tau_min), tau_max))
 
     def create_ant_colony(self, ant_number: int, alpha: float, beta: float):
         assert ant_number > 0
         for i in range(ant_number):
             ant = Ant(len(self.get_ants()), alpha, beta, self.__nest)
+            ant.set_q0(self.__ant_q0)
             self.add_ants(ant)
         return
 
@@ -113,18 +245,20 @@ class Civilization:
         self.__ants = []
         return
 
-    def get_distance_matrix(self):
+    def get_distance_matrix(self, missing_value: float = 500.0, scaled: bool = True):
         n = len(self.__cities)
         # On utilise une valeur par défaut élevée pour les villes non connectées directement.
-        D = np.full((n, n), 500.0)
+        D = np.full((n, n), missing_value)
         np.fill_diagonal(D, 0)
+        # On suppose que chaque ville est unique dans la liste
+        index = {city: i for i, city in enumerate(self.__cities)}
+        scale_factor = self.__scale_factor if scaled else 1
         # Pour chaque route, on met à jour la matrice.
         for road in self.__roads:
             start, end = road.get_cities()
-            # On suppose que chaque ville est unique dans la liste
-            i = self.__cities.index(start)
-            j = self.__cities.index(end)
-            distance = road.get_weight() * self.__scale_factor
+            i = index[start]
+            j = index[end]
+            distance = road.get_weight() * scale_factor
             D[i, j] = distance
             D[j, i] = distance  # Supposons que les routes sont bidirectionnelles
         return D
@@ -194,14 +328,38 @@ class Civilization:
             ant.mutation()
         self.migration()
 
+    def set_profiler(self, profiler: PhaseProfiler):
+        """
+        Installe un PhaseProfiler (None pour le retirer) qui chronomètre les
+        phases de step() et de la boucle génétique.
+        """
+        self.__profiler = profiler
+
+    def get_profiler(self):
+        return self.__profiler
+
     def step(self):
+        profiler = self.__profiler
+        if profiler is not None:
+            start = profiler.clock()
         self.steps += 1
-        if self.steps == self.__half_pheromone_time:
+        # En MMAS, les bornes remplacent la division par deux
+        if (
+            self.steps == self.__half_pheromone_time
+            and self.__mmas is None
+            and self.__acs is None
+        ):
             self.halve_pheromone()
+        if profiler is not None:
+            start = profiler.lap("halve_check", start)
 
-        # Évaporation des phéromones
-        for road in self.__roads:
-            road.evaporate_pheromone()
+        # Évaporation des phéromones (en ACS, seulement sur le meilleur circuit)
+        if self.__acs is None:
+            self.evaporate_pheromone()
+        if profiler is not None:
+            start = profiler.lap("evaporation", start)
+        completed_tours = []  # circuits à améliorer avant dépôt
+        finished_tours = []  # circuits déjà déposés, à comptabiliser
         for ant in self.__ants:
             # Si la fourmi a finit son cycle
             if (
@@ -210,29 +368,11 @@ class Civilization:
             ):
                 ant.set_food_quantity()
                 if ant.get_explored_roads():
-                    new_road = tuple(
-                        [road.get_id() for road in ant.get_explored_roads()]
-                    )
-
-                    def compare_keys(tuple1, tuple2):
-                        for i in range(len(tuple1)):
-                            if (
-                                tuple1[i][0] != tuple2[i][0]
-                                or tuple1[i][1] != tuple2[i][1]
-                            ):
-                                return False
-                        return True
-
-                    if any(
-                        compare_keys(new_road, key)
-                        for key in ant.get_explored_roads_count().keys()
-                    ):
-                        ant.increment_explored_roads(new_road)
-                    else:
-                        ant.add_explored_roads_count(new_road)
-                        ant.increment_explored_roads(new_road)
+                    ant.register_explored_path()
                 ant.set_cumulated_weights(0)
                 ant.reset_explored_roads()
+            if profiler is not None:
+                start = profiler.lap("arrival", start)
 
             # Si la fourmi a une destination, elle s'y déplace
             if ant.get_next_city() is not None:
@@ -245,46 +385,603 @@ class Civilization:
                     )
                     ant.set_next_city(next_city)
                     ant.add_explored_road(next_road)
-                    ant.set_cumulated_weights(
-                        sum([road.get_weight() for road in ant.get_explored_roads()])
-                    )
-                    for road in ant.get_explored_roads():
-                        ant.deposit_pheromone(road)
+                    self.__acs_local_update(next_road)
+                    if profiler is not None:
+                        start = profiler.lap("move", start)
+                    if (
+                        self.__local_search is None
+                        and self.__mmas is None
+                        and self.__acs is None
+                    ):
+                        ant.set_cumulated_weights(
+                            sum(
+                                [road.get_weight() for road in ant.get_explored_roads()]
+                            )
+                        )
+                        for road in ant.get_explored_roads():
+                            ant.deposit_pheromone(road)
+                        finished_tours.append(
+                            (
+                                ant,
+                                [self.__nest]
+                                + ant.get_visited_cities()
+                                + [self.__nest],
+                            )
+                        )
+                    else:
+                        completed_tours.append(
+                            (
+                                ant,
+                                [self.__nest]
+                                + ant.get_visited_cities()
+                                + [self.__nest],
+                            )
+                        )
                     ant.reset_visited_cities()
+                    if profiler is not None:
+                        start = profiler.lap("deposit", start)
                 else:
                     ant.set_next_city(None)  # Réinitialiser pour le prochain choix
+                    if profiler is not None:
+                        start = profiler.lap("move", start)
 
             else:
-                unvisited_cities = [
-                    city
-                    for city in self.__cities
-                    if city not in ant.get_visited_cities() and city != self.get_nest()
-                ]
-                outgoing_roads = []
-                for road in ant.get_current_city().get_roads():
-                    if road.get_cities()[0] != ant.get_current_city():
-                        if road.get_cities()[0] in unvisited_cities:
-                            outgoing_roads.append(road)
+                current_city = ant.get_current_city()
+                # Les plus proches voisines d'abord, toutes les routes sinon
+                scanned = len(current_city.get_candidate_roads())
+                outgoing_roads, js = self.__open_roads(ant, current_city, True)
+                if not outgoing_roads:
+                    scanned += len(current_city.get_roads())
+                    outgoing_roads, js = self.__open_roads(ant, current_city, False)
+                if profiler is not None:
+                    start = profiler.lap("candidates", start)
+                    profiler.count("roads_scanned", scanned)
 
-                    elif road.get_cities()[1] != ant.get_current_city():
-                        if road.get_cities()[1] in unvisited_cities:
-                            outgoing_roads.append(road)
-
-                next_road = ant.weighted_choice(outgoing_roads)
+                if self.__store is not None:
+                    next_road = self.__matrix_choice(ant, outgoing_roads, js)
+                else:
+                    next_road = ant.weighted_choice(outgoing_roads)
+                if profiler is not None:
+                    start = profiler.lap("choice", start)
+                    profiler.count("choices")
                 ant.add_explored_road(next_road)
+                self.__acs_local_update(next_road)
                 if next_road.get_cities()[1] != ant.get_current_city():
                     next_city = next_road.get_cities()[1]
                 else:
                     next_city = next_road.get_cities()[0]
                 ant.set_next_city(next_city)
                 ant.add_visited_cities(next_city)
+                if profiler is not None:
+                    start = profiler.lap("move", start)
+
+        if finished_tours:
+            tours, lengths = self.__completed_tours_to_arrays(finished_tours)
+            self.__record_tours(tours, lengths, np.isfinite(lengths))
+        if completed_tours:
+            self.__deposit_completed_tours(completed_tours)
+        if profiler is not None:
+            profiler.lap("deposit", start)
+
+    def __open_roads(self, ant, city, candidates: bool):
+        """
+        Routes de city (ses candidates, ou toutes) menant à une ville que la
+        fourmi n'a pas visitée. Avec le backend "matrix", le filtre est fait
+        sur les tableaux de voisines de la PheromoneMatrix, et les lignes des
+        villes d'arrivée sont retournées avec les routes (None sinon).
+        """
+        roads = city.get_candidate_roads() if candidates else city.get_roads()
+        if self.__store is None:
+            return self.__unvisited_roads(ant, roads), None
+        i = self.__store.get_index(city)
+        if candidates:
+            if not roads:
+                return [], None
+            js = self.__candidates[i, : len(roads)]
+        else:
+            js = self.__store.get_neighbours(i)
+        ids = self.__store.get_ids()[js]
+        mask = np.frombuffer(ant.get_visited_mask(), dtype=np.uint8)
+        visited = np.zeros(len(js), dtype=bool)
+        known = ids < len(mask)
+        visited[known] = mask[ids[known]] == 1
+        keep = np.flatnonzero(~visited & (js != self.__store.get_index(self.__nest)))
+        return [roads[k] for k in keep], js[keep]
+
+    def __matrix_choice(self, ant, roads, js):
+        """Lit les phéromones et poids des candidates en une seule indexation."""
+        i = self.__store.get_index(ant.get_current_city())
+        pheromones = self.__store.get_pheromone_matrix()[i, js]
+        weights = self.__store.get_weight_matrix()[i, js]
+        return ant.weighted_choice_matrix(roads, pheromones, weights)
+
+    def set_local_search(self, mode):
+        """
+        Active la recherche locale 2-opt avant le dépôt de phéromones :
+        None (désactivée), "all" (chaque circuit terminé) ou "best" (le
+        meilleur circuit de l'itération).
+        """
+        assert mode in (None, "all", "best")
+        self.__local_search = mode
+
+    def get_local_search(self):
+        return self.__local_search
+
+    def set_acs(
+        self, enabled: bool, q0: float = 0.9, xi: float = 0.1, tau0: float = None
+    ):
+        """
+        Active l'Ant Colony System : les fourmis exploitent avec probabilité
+        q0, chaque route empruntée est rapprochée de tau0
+        (tau <- (1 - xi) tau + xi tau0) et seul le meilleur circuit trouvé
+        est renforcé (tau <- (1 - rho) tau + rho / L²), sans évaporation
+        globale. Par défaut tau0 = 1 / (n L_nn²), L_nn étant la longueur du
+        circuit du plus proche voisin, et toutes les routes partent de tau0.
+        Désactivé, les fourmis reprennent q0 = 0.25.
+        """
+        assert 0 <= q0 <= 1 and 0 < xi < 1
+        assert not enabled or self.__mmas is None
+        self.__acs = None
+        if enabled:
+            if tau0 is None:
+                length = self.__nearest_neighbour_length()
+                tau0 = 1 / (len(self.__cities) * length * length)
+            self.__acs = (q0, xi, tau0)
+            self.reset_pheromones(tau0)
+        self.__ant_q0 = q0 if enabled else 0.25
+        for ant in self.__ants:
+            ant.set_q0(self.__ant_q0)
+
+    def get_acs(self):
+        """(q0, xi, tau0) si l'ACS est actif, None sinon."""
+        return self.__acs
+
+    def __nearest_neighbour_length(self):
+        # Circuit glouton depuis le nid ; somme des poids si la fourmi bloque
+        current_city = self.__nest
+        visited = {current_city}
+        length = 0
+        while len(visited) < len(self.__cities):
+            roads = [
+                road
+                for road in current_city.get_roads()
+                if self.__other_city(road, current_city) not in visited
+            ]
+            if not roads:
+                return sum(road.get_weight() for road in self.__roads)
+            road = min(roads, key=lambda road: road.get_weight())
+            length += road.get_weight()
+            current_city = self.__other_city(road, current_city)
+            visited.add(current_city)
+        closing_road = self.get_road_by_cities(current_city, self.__nest)
+        if closing_road is None:
+            return sum(road.get_weight() for road in self.__roads)
+        return length + closing_road.get_weight()
+
+    def __acs_local_update(self, road):
+        if self.__acs is None:
+            return
+        _, xi, tau0 = self.__acs
+        road.set_pheromone((1 - xi) * road.get_pheromone() + xi * tau0)
+
+    def __acs_global_update(self):
+        if self.__best_tour is None:
+            return
+        rho = self.__evaporation_rate
+        amount = 1 / (self.__best_length * self.__best_length)
+        tour = self.__best_tour
+        if self.__store is not None:
+            self.__store.blend(tour[:-1], tour[1:], rho, amount)
+            return
+        for i, j in zip(tour[:-1], tour[1:]):
+            road = self.get_road_by_cities(self.__cities[i], self.__cities[j])
+            road.set_pheromone((1 - rho) * road.get_pheromone() + rho * amount)
+
+    def __get_local_search_matrix(self):
+        # Poids bruts, distance infinie entre villes non reliées
+        if self.__local_search_matrix is None:
+            self.__local_search_matrix = self.get_distance_matrix(np.inf, False)
+        return self.__local_search_matrix
+
+    def improve_tours(self, tours, lengths, valid):
+        """
+        Applique la recherche locale à des circuits exprimés en indices de
+        get_cities() (voir construct_tours). Modifie tours et lengths en place.
+        """
+        if self.__local_search is None or not valid.any():
+            return tours, lengths
+        D = self.__get_local_search_matrix()
+        if self.__local_search == "all":
+            to_improve = np.flatnonzero(valid)
+        else:
+            to_improve = [int(np.argmin(np.where(valid, lengths, np.inf)))]
+        for k in to_improve:
+            tours[k] = two_opt(tours[k], D)
+            lengths[k] = tour_length(tours[k], D)
+        return tours, lengths
+
+    def __completed_tours_to_arrays(self, completed_tours):
+        # Circuits terminés pendant un step : (fourmi, villes du circuit)
+        tours = np.array(
+            [
+                [self.__city_indices[city] for city in tour]
+                for _, tour in completed_tours
+            ]
+        )
+        D = self.__get_local_search_matrix()
+        return tours, D[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+
+    def __deposit_completed_tours(self, completed_tours):
+        tours, lengths = self.__completed_tours_to_arrays(completed_tours)
+        valid = np.isfinite(lengths)
+        tours, lengths = self.improve_tours(tours, lengths, valid)
+        for (ant, _), length in zip(completed_tours, lengths):
+            ant.set_cumulated_weights(length)
+        self.__deposit_tours(tours, lengths, valid)
+
+    def __deposit_tours(self, tours, lengths, valid):
+        """
+        Dépose les circuits valides, chacun à raison de 1 / longueur² par
+        arête comme Ant.compute_pheromone. En MMAS, un seul circuit dépose
+        puis les phéromones sont bornées.
+        """
+        k, improved = self.__record_tours(tours, lengths, valid)
+        if self.__acs is not None:
+            self.__acs_global_update()
+            return
+        if self.__mmas is not None:
+            tours, lengths = self.__mmas_selection(tours, lengths, k, improved)
+        else:
+            tours, lengths = tours[valid], lengths[valid]
+        if len(tours) > 0:
+            amounts = 1 / (lengths * lengths)
+            if self.__store is not None:
+                self.__store.deposit(
+                    tours[:, :-1].ravel(),
+                    tours[:, 1:].ravel(),
+                    np.repeat(amounts, tours.shape[1] - 1),
+                )
+            else:
+                for tour, amount in zip(tours, amounts):
+                    for i, j in zip(tour[:-1], tour[1:]):
+                        road = self.get_road_by_cities(
+                            self.__cities[i], self.__cities[j]
+                        )
+                        road.add_pheromone(amount)
+        if self.__mmas_bounds is not None:
+            self.clamp_pheromones(*self.__mmas_bounds)
+
+    def set_mmas(self, mode, p_best: float = 0.05, stagnation: int = 50):
+        """
+        Active le MAX-MIN Ant System : None (Ant System classique),
+        "iteration" (seul le meilleur circuit de l'itération dépose) ou
+        "global" (seul le meilleur circuit trouvé dépose). Les phéromones
+        sont bornées à [tau_min, tau_max], calculées à partir du meilleur
+        circuit et de p_best, et réinitialisées à tau_max après stagnation
+        mises à jour sans amélioration.
+        """
+        assert mode in (None, "iteration", "global")
+        assert 0 < p_best < 1 and stagnation > 0
+        assert mode is None or self.__acs is None
+        self.__mmas = mode
+        self.__mmas_p_best = p_best
+        self.__mmas_stagnation = stagnation
+        self.__mmas_bounds = None
+        self.__mmas_idle_updates = 0
+
+    def get_mmas(self):
+        return self.__mmas
+
+    def get_mmas_parameters(self):
+        """(p_best, stagnation) donnés à set_mmas."""
+        return self.__mmas_p_best, self.__mmas_stagnation
+
+    def get_mmas_bounds(self):
+        """(tau_min, tau_max), None tant qu'aucun circuit n'a été trouvé."""
+        return self.__mmas_bounds
+
+    def __compute_mmas_bounds(self):
+        n = len(self.__cities)
+        tau_max = 1 / (self.__evaporation_rate * self.__best_length**2)
+        root = self.__mmas_p_best ** (1 / n)
+        tau_min = tau_max * (1 - root) / (max(n / 2 - 1, 1) * root)
+        return float(min(tau_min, tau_max)), float(tau_max)
+
+    def __record_tours(self, tours, lengths, valid):
+        """
+        Retient le meilleur circuit de l'itération et le meilleur circuit
+        trouvé. Retourne l'indice du meilleur circuit de l'itération (None
+        s'il n'y en a pas) et un booléen indiquant s'il améliore le meilleur
+        circuit.
+        """
+        if not valid.any():
+            return None, False
+        k = int(np.argmin(np.where(valid, lengths, np.inf)))
+        self.__iteration_best_tour = tours[k].copy()
+        self.__iteration_best_length = float(lengths[k])
+        self.__iteration_best_tour_cities = None
+        if lengths[k] < self.__best_length:
+            self.__best_tour = self.__iteration_best_tour
+            self.__best_length = self.__iteration_best_length
+            self.__best_tour_cities = None
+            return k, True
+        return k, False
+
+    def __tour_cities(self, tour):
+        if tour is None:
+            return None
+        return [self.__cities[i] for i in tour]
+
+    def get_best_tour(self):
+        """Meilleur circuit trouvé (liste de City), None s'il n'y en a pas."""
+        if self.__best_tour_cities is None:
+            self.__best_tour_cities = self.__tour_cities(self.__best_tour)
+        return self.__best_tour_cities
+
+    def get_best_tour_length(self):
+        return self.__best_length
+
+    def get_iteration_best_tour(self):
+        """Meilleur circuit de la dernière itération (ou du dernier step)."""
+        if self.__iteration_best_tour_cities is None:
+            self.__iteration_best_tour_cities = self.__tour_cities(
+                self.__iteration_best_tour
+            )
+        return self.__iteration_best_tour_cities
+
+    def get_iteration_best_tour_length(self):
+        return self.__iteration_best_length
+
+    def __mmas_selection(self, tours, lengths, k, improved):
+        """Choisit le circuit qui dépose et gère la réinitialisation."""
+        if k is None:
+            return tours[:0], lengths[:0]
+        if improved:
+            first_tour = self.__mmas_bounds is None
+            self.__mmas_bounds = self.__compute_mmas_bounds()
+            self.__mmas_idle_updates = 0
+            if first_tour:
+                self.reset_pheromones(self.__mmas_bounds[1])
+        else:
+            self.__mmas_idle_updates += 1
+            if self.__mmas_bounds is None:
+                # Meilleur circuit connu d'avant l'activation du MMAS
+                self.__mmas_bounds = self.__compute_mmas_bounds()
+        if self.__mmas_idle_updates >= self.__mmas_stagnation:
+            # Stagnation : les pistes repartent de tau_max
+            self.__mmas_idle_updates = 0
+            self.reset_pheromones(self.__mmas_bounds[1])
+            return tours[:0], lengths[:0]
+        if self.__mmas == "global":
+            return self.__best_tour[None, :], np.array([self.__best_length])
+        return tours[k : k + 1], lengths[k : k + 1]
+
+    def __unvisited_roads(self, ant, roads):
+        current_city = ant.get_current_city()
+        nest = self.get_nest()
+        unvisited_roads = []
+        for road in roads:
+            start, end = road.get_cities()
+            next_city = start if end == current_city else end
+            if next_city != nest and not ant.has_visited(next_city):
+                unvisited_roads.append(road)
+        return unvisited_roads
+
+    def build_candidate_lists(self, k: int = 10):
+        """
+        Associe à chaque ville les routes vers ses k plus proches voisines
+        (au sens du poids des routes). step() et construct_tours restreignent
+        alors les choix à ces candidates, et ne considèrent toutes les routes
+        que lorsque les candidates ont toutes été visitées.
+        """
+        n = len(self.__cities)
+        index = {city: i for i, city in enumerate(self.__cities)}
+        max_weight = max((road.get_weight() for road in self.__roads), default=1.0)
+        missing = 10 * max_weight + 1  # distance des villes non reliées
+        D = np.full((n, n), missing)
+        np.fill_diagonal(D, 0)
+        for road in self.__roads:
+            start, end = road.get_cities()
+            D[index[start], index[end]] = D[index[end], index[start]] = (
+                road.get_weight()
+            )
+
+        neighbors = NearestNeighbors(n_neighbors=min(k + 1, n), metric="precomputed")
+        distances, indices = neighbors.fit(D).kneighbors(D)
+        self.__candidates = np.full((n, k), -1, dtype=int)
+        for i, city in enumerate(self.__cities):
+            candidates = [
+                j for d, j in zip(distances[i], indices[i]) if j != i and d < missing
+            ][:k]
+            self.__candidates[i, : len(candidates)] = candidates
+            city.set_candidate_roads(
+                [self.get_road_by_cities(city, self.__cities[j]) for j in candidates]
+            )
+        return
+
+    def get_candidate_list_size(self):
+        """k de build_candidate_lists, None sans listes de candidates."""
+        return None if self.__candidates is None else self.__candidates.shape[1]
+
+    def clear_candidate_lists(self):
+        self.__candidates = None
+        for city in self.__cities:
+            city.set_candidate_roads([])
+
+    def construct_tours(self, rng=None):
+        """
+        Construit d'un coup un circuit par fourmi (backend "matrix" requis).
+        Retourne (tours, lengths, valid), les tours étant exprimés en indices
+        de get_cities().
+        """
+        assert self.__store is not None
+        builder = ColonyTourBuilder(
+            self.__store,
+            [ant.get_parameters()[0] for ant in self.__ants],
+            [ant.get_parameters()[1] for ant in self.__ants],
+            [ant.get_q0() for ant in self.__ants],
+            rng,
+            self.__candidates,
+            None if self.__acs is None else self.__acs[1:],
+        )
+        return builder.build(self.__store.get_index(self.__nest))
+
+    def __build_tour(self, ant, index):
+        """
+        Circuit complet d'une fourmi avec le backend "objects", en indices de
+        get_cities(). Retourne (tour, longueur), tour valant None si la
+        fourmi est bloquée.
+        """
+        current_city = self.__nest
+        visited = {current_city}
+        tour = [index[current_city]]
+        length = 0
+        while len(tour) < len(self.__cities):
+            outgoing_roads = [
+                road
+                for road in current_city.get_candidate_roads()
+                if self.__other_city(road, current_city) not in visited
+            ]
+            if not outgoing_roads:
+                outgoing_roads = [
+                    road
+                    for road in current_city.get_roads()
+                    if self.__other_city(road, current_city) not in visited
+                ]
+            if not outgoing_roads:
+                return None, np.inf
+            road = ant.weighted_choice(outgoing_roads)
+            self.__acs_local_update(road)
+            current_city = self.__other_city(road, current_city)
+            visited.add(current_city)
+            tour.append(index[current_city])
+            length += road.get_weight()
+        closing_road = self.get_road_by_cities(current_city, self.__nest)
+        if closing_road is None:
+            return None, np.inf
+        self.__acs_local_update(closing_road)
+        tour.append(tour[0])
+        return tour, length + closing_road.get_weight()
+
+    @staticmethod
+    def __other_city(road, city):
+        start, end = road.get_cities()
+        return end if start == city else start
+
+    def __build_tours(self):
+        index = self.__city_indices
+        n = len(self.__cities)
+        tours = np.full((len(self.__ants), n + 1), index[self.__nest], dtype=int)
+        lengths = np.full(len(self.__ants), np.inf)
+        for k, ant in enumerate(self.__ants):
+            tour, lengths[k] = self.__build_tour(ant, index)
+            if tour is not None:
+                tours[k] = tour
+        return tours, lengths, np.isfinite(lengths)
+
+    def iteration(self, rng=None):
+        """
+        Itération complète, sans animation : chaque fourmi construit un
+        circuit entier, puis les phéromones s'évaporent et les circuits sont
+        déposés une seule fois. step() reste le mode pas à pas du
+        visualiseur. Retourne (tours, lengths, valid) comme construct_tours.
+        """
+        self.iterations += 1
+        if self.__store is not None:
+            tours, lengths, valid = self.construct_tours(rng)
+        else:
+            tours, lengths, valid = self.__build_tours()
+        tours, lengths = self.improve_tours(tours, lengths, valid)
+
+        if self.__acs is None:
+            self.evaporate_pheromone()
+        for ant, tour, length, is_valid in zip(self.__ants, tours, lengths, valid):
+            if not is_valid:
+                continue
+            ant.set_food_quantity()
+            ant.set_cumulated_weights(length)
+            signature = 0
+            for i, j in zip(tour[:-1], tour[1:]):
+                road = self.get_road_by_cities(self.__cities[i], self.__cities[j])
+                signature = extend_signature(signature, road.get_id())
+            ant.register_explored_path(signature)
+        self.__deposit_tours(tours, lengths, valid)
+        return tours, lengths, valid
+
+    def run_iterations(self, iterations: int, rng=None):
+        """
+        Enchaîne au plus iterations appels à iteration(), en s'arrêtant à la
+        convergence si un moniteur est installé. Retourne le nombre
+        d'itérations effectuées.
+        """
+        monitor = self.__convergence_monitor
+        if monitor is not None:
+            monitor.reset()
+        for i in range(iterations):
+            self.iteration(rng)
+            if monitor is not None and monitor.update(self):
+                return i + 1
+        return iterations
+
+    def __matrix_ranking(self):
+        """
+        Voisines de chaque ville triées par phéromone décroissante (à égalité,
+        par indice croissant, comme l'argmax de __matrix_best_path).
+        """
+        pheromone = np.where(
+            self.__store.get_edge_mask(), self.__store.get_pheromone_matrix(), -1
+        )
+        return np.argsort(-pheromone, axis=1, kind="stable")
+
+    def __matrix_best_path(self):
+        pheromone = self.__store.get_pheromone_matrix()
+        edges = self.__store.get_edge_mask()
+        visited = np.zeros(len(self.__cities), dtype=bool)
+        current = self.__store.get_index(self.__nest)
+        visited[current] = True
+        path = [current]
+        while not visited.all():
+            candidates = edges[current] & ~visited
+            if not candidates.any():
+                break
+            current = int(np.argmax(np.where(candidates, pheromone[current], -1)))
+            visited[current] = True
+            path.append(current)
+        path.append(path[0])
+        cities = {self.__store.get_index(city): city for city in self.__cities}
+        return [cities[i] for i in path]
 
     def get_best_path(self):
         """
         Retourne une liste d'objets City représentant le circuit basé sur
         les niveaux actuels de phéromones. Le circuit démarre d'une ville
         de départ, visite chaque ville une seule fois, puis retourne à cette ville.
+        Le circuit est mis en cache jusqu'à ce que le classement des routes
+        d'une ville par phéromone change : la liste retournée est partagée et
+        ne doit pas être modifiée. Avec le backend "matrix", le classement de
+        toutes les villes est recalculé (un argsort) après chaque modification
+        de la matrice, et le circuit seulement si ce classement a changé.
         """
+        if self.__store is None:
+            version = self.__ranking.get_version()
+            if self.__best_path is None or self.__best_path_version != version:
+                self.__best_path = self.__greedy_path()
+                self.__best_path_version = version
+            return self.__best_path
+
+        version = self.__store.get_version()
+        if self.__best_path is not None and self.__best_path_version == version:
+            return self.__best_path
+        ranking = self.__matrix_ranking()
+        if self.__best_path is None or not np.array_equal(
+            ranking, self.__best_path_ranking
+        ):
+            self.__best_path = self.__matrix_best_path()
+            self.__best_path_ranking = ranking
+        self.__best_path_version = version
+        return self.__best_path
+
+    def __greedy_path(self):
         path = []
         current_city = self.__nest
         path.append(current_city)
@@ -292,28 +989,18 @@ class Civilization:
 
         # Tant que toutes les villes n'ont pas été visitées
         while len(visited) < len(self.__cities):
-            outgoing_roads = current_city.get_roads()
+            # Première route du classement menant à une ville non visitée
             best_road = None
-            best_pheromone = -1
-
-            # Sélectionner la route menant à une ville non visitée ayant la plus forte phéromone
-            for road in outgoing_roads:
-                start, dest = road.get_cities()
-                next_city = dest if start == current_city else start
-                if next_city in visited:
-                    continue
-                if road.get_pheromone() > best_pheromone:
+            for road in self.__ranking.get_ranking(current_city):
+                if self.__other_city(road, current_city) not in visited:
                     best_road = road
-                    best_pheromone = road.get_pheromone()
+                    break
 
             # Sécurité (inutile dans un graphe complet, a priori)
             if best_road is None:
                 break
 
-            # Récupérer la ville suivante depuis la route sélectionnée
-            start, dest = best_road.get_cities()
-            next_city = dest if start == current_city else start
-
+            next_city = self.__other_city(best_road, current_city)
             path.append(next_city)
             visited.add(next_city)
             current_city = next_city
@@ -322,18 +1009,51 @@ class Civilization:
         path.append(path[0])
         return path
 
-    def genetic_algo_application(self):
-        for i in range(self.__steps_genetic_algo):
+    def set_convergence_monitor(self, monitor: ConvergenceMonitor):
+        """
+        Installe un ConvergenceMonitor (None pour le retirer) : chaque
+        génération s'arrête dès qu'il détecte la convergence.
+        """
+        self.__convergence_monitor = monitor
+
+    def get_convergence_monitor(self):
+        return self.__convergence_monitor
+
+    def run_generation(self, steps: int = None, interrupted=None):
+        """
+        Lance au plus steps steps (par défaut steps_genetic_algo), en
+        s'arrêtant à la convergence si un moniteur est installé, ou avant un
+        step si interrupted() est vrai. Retourne le nombre de steps effectués.
+        """
+        if steps is None:
+            steps = self.__steps_genetic_algo
+        monitor = self.__convergence_monitor
+        if monitor is not None:
+            monitor.reset()
+        for i in range(steps):
+            if interrupted is not None and interrupted():
+                return i
             self.step()
+            if monitor is not None and monitor.update(self):
+                return i + 1
+        return steps
+
+    def genetic_algo_application(self):
+        self.run_generation()
+        profiler = self.__profiler
         threshold_genetic_algo = self.__threshold_genetic_algo
         while threshold_genetic_algo > 0:
+            if profiler is not None:
+                start = profiler.clock()
             self.genetic_algo()
-            for road in self.__roads:
-                road.reset_pheromone(self.__initial_pheromone)
+            if profiler is not None:
+                start = profiler.lap("genetic_algo", start)
+            self.reset_pheromones()
             for ant in self.__ants:
                 ant.reset_ant()
-            for i in range(self.__steps_genetic_algo):
-                self.step()
+            if profiler is not None:
+                profiler.lap("ga_reset", start)
+            self.run_generation()
             threshold_genetic_algo -= 1
 
     def best_worker(self):
@@ -371,12 +1091,16 @@ class Civilization:
         alpha_explore.append(best_explorer[0].get_parameters()[0])
         beta_explore.append(best_explorer[0].get_parameters()[1])
 
-        for i in range(self.__steps_genetic_algo):
-            self.step()
+        self.run_generation()
 
+        profiler = self.__profiler
         threshold_genetic_algo = self.__threshold_genetic_algo
         while threshold_genetic_algo > 0:
+            if profiler is not None:
+                start = profiler.clock()
             self.genetic_algo()
+            if profiler is not None:
+                profiler.lap("genetic_algo", start)
             best_worker = self.best_worker()
             best_explorer = self.best_explorer()
 
@@ -389,8 +1113,7 @@ class Civilization:
 
             for ant in self.__ants:
                 ant.reset_ant()
-            for i in range(self.__steps_genetic_algo):
-                self.step()
+            self.run_generation()
 
             threshold_genetic_algo -= 1
 
@@ -0,0 +1,65 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from tsp.civilization import Civilization
+from tsp.parallel_ga import build_civilization, export_civilization
+
+
+class GeneticAlgorithmWorker(QThread):
+    """
+    Exécute l'algorithme génétique du visualiseur dans un thread séparé, pour
+    que la fenêtre reste réactive. Le thread travaille sur sa propre copie de
+    la civilisation (même graphe, mêmes positions, mêmes génomes) : la
+    civilisation affichée n'est jamais modifiée pendant le calcul. La copie
+    finale est transmise d'un bloc par le signal completed.
+    """
+
+    # (génération courante, nombre total de générations)
+    progress = pyqtSignal(int, int)
+    # Civilisation finale, à substituer à celle du canvas
+    completed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, civ: Civilization, nb_steps: int = 100, parent=None):
+        super().__init__(parent)
+        assert nb_steps > 0
+        # La copie est décrite dans le thread principal, qui possède civ
+        self.__spec = export_civilization(civ, with_positions=True)
+        self.__genomes = [ant.get_parameters() for ant in civ.get_ants()]
+        self.__generations = civ.get_threshold_genetic_algo()
+        self.__nb_steps = nb_steps
+
+    def get_generations(self):
+        return self.__generations
+
+    def cancel(self):
+        """Demande l'arrêt ; le thread s'arrête au prochain step."""
+        self.requestInterruption()
+
+    def __run_generation(self, civ):
+        """Une génération d'au plus nb_steps steps ; False si interrompue."""
+        civ.run_generation(self.__nb_steps, self.isInterruptionRequested)
+        return not self.isInterruptionRequested()
+
+    def run(self):
+        try:
+            civ = build_civilization(self.__spec)
+            for alpha, beta in self.__genomes:
+                civ.create_ant_colony(1, alpha, beta)
+
+            if not self.__run_generation(civ):
+                self.cancelled.emit()
+                return
+            for generation in range(self.__generations):
+                self.progress.emit(generation, self.__generations)
+                civ.genetic_algo()
+                for ant in civ.get_ants():
+                    ant.reset_ant()
+                civ.reset_pheromones()
+                if not self.__run_generation(civ):
+                    self.cancelled.emit()
+                    return
+            self.progress.emit(self.__generations, self.__generations)
+            self.completed.emit(civ)
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
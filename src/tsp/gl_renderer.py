@@ -0,0 +1,327 @@
+import numpy as np
+from PyQt5.QtGui import (
+    QOpenGLBuffer,
+    QOpenGLShader,
+    QOpenGLShaderProgram,
+    QOpenGLVersionProfile,
+)
+
+# Constantes OpenGL utilisées (évite une dépendance à PyOpenGL)
+GL_FLOAT = 0x1406
+GL_TRIANGLES = 0x0004
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+
+# Couleurs des routes sans phéromone et au maximum de phéromone
+LOW_COLOR = (1.0, 1.0, 1.0)
+HIGH_COLOR = (37 / 255, 110 / 255, 1.0)
+
+# Une route est un quadrilatère (2 triangles) : (abscisse le long de la route,
+# côté) de chacun des 6 sommets
+SEGMENT_CORNERS = np.array(
+    [(0, -1), (1, -1), (1, 1), (0, -1), (1, 1), (0, 1)], dtype=np.float32
+)
+# Une fourmi est un carré dans lequel le fragment shader découpe un disque
+DISC_CORNERS = np.array(
+    [(-1, -1), (1, -1), (1, 1), (-1, -1), (1, 1), (-1, 1)], dtype=np.float32
+)
+
+SEGMENT_VERTEX_SHADER = """
+attribute vec2 a_start;
+attribute vec2 a_end;
+attribute vec2 a_corner;
+attribute vec2 a_width;
+attribute float a_intensity;
+uniform vec2 u_viewport;
+uniform vec2 u_origin;
+uniform vec3 u_low;
+uniform vec3 u_high;
+varying vec3 v_color;
+
+void main() {
+    vec2 direction = a_end - a_start;
+    float len = length(direction);
+    vec2 normal = len > 0.0 ? vec2(-direction.y, direction.x) / len : vec2(0.0);
+    float width = a_width.x + a_width.y * a_intensity;
+    vec2 position = u_origin + mix(a_start, a_end, a_corner.x)
+        + normal * a_corner.y * width * 0.5;
+    gl_Position = vec4(
+        position.x / u_viewport.x * 2.0 - 1.0,
+        1.0 - position.y / u_viewport.y * 2.0,
+        0.0,
+        1.0
+    );
+    v_color = mix(u_low, u_high, a_intensity);
+}
+"""
+
+SEGMENT_FRAGMENT_SHADER = """
+varying vec3 v_color;
+
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+DISC_VERTEX_SHADER = """
+attribute vec2 a_position;
+attribute vec2 a_local;
+attribute vec4 a_color;
+uniform vec2 u_viewport;
+uniform vec2 u_origin;
+varying vec2 v_local;
+varying vec4 v_color;
+
+void main() {
+    vec2 position = u_origin + a_position;
+    gl_Position = vec4(
+        position.x / u_viewport.x * 2.0 - 1.0,
+        1.0 - position.y / u_viewport.y * 2.0,
+        0.0,
+        1.0
+    );
+    v_local = a_local;
+    v_color = a_color;
+}
+"""
+
+DISC_FRAGMENT_SHADER = """
+varying vec2 v_local;
+varying vec4 v_color;
+
+void main() {
+    float distance = length(v_local);
+    if (distance > 1.0)
+        discard;
+    float alpha = 1.0 - smoothstep(0.85, 1.0, distance);
+    gl_FragColor = vec4(v_color.rgb, v_color.a * alpha);
+}
+"""
+
+
+def segment_vertices(starts, ends, base_width: float, width_gain: float):
+    """
+    Sommets (6 par segment) du buffer statique des routes : départ, arrivée,
+    coin et largeur (largeur de base, gain selon l'intensité), 8 floats.
+    """
+    m = len(starts)
+    vertices = np.empty((m, 6, 8), dtype=np.float32)
+    vertices[:, :, 0:2] = np.asarray(starts, dtype=np.float32)[:, None, :]
+    vertices[:, :, 2:4] = np.asarray(ends, dtype=np.float32)[:, None, :]
+    vertices[:, :, 4:6] = SEGMENT_CORNERS
+    vertices[:, :, 6] = base_width
+    vertices[:, :, 7] = width_gain
+    return vertices.reshape(-1, 8)
+
+
+def disc_vertices(centers, radius: float, colors):
+    """Sommets (6 par disque) : position, coin local et couleur rgba, 8 floats."""
+    k = len(centers)
+    vertices = np.empty((k, 6, 8), dtype=np.float32)
+    vertices[:, :, 0:2] = (
+        np.asarray(centers, dtype=np.float32)[:, None, :] + DISC_CORNERS * radius
+    )
+    vertices[:, :, 2:4] = DISC_CORNERS
+    vertices[:, :, 4:8] = np.asarray(colors, dtype=np.float32)[:, None, :]
+    return vertices.reshape(-1, 8)
+
+
+class GraphRenderer:
+    """
+    Dessine les routes et les fourmis du canvas en quelques appels OpenGL.
+    Les extrémités des routes sont dans un buffer statique, reconstruit
+    seulement quand le graphe ou les positions des villes changent ; seule
+    l'intensité de phéromone (une valeur par sommet) est envoyée à chaque
+    image. La couleur et l'épaisseur sont calculées par le vertex shader.
+    Les coordonnées sont celles du QPainter du canvas, en pixels, décalées
+    de origin (la translation appliquée au QPainter).
+    """
+
+    def __init__(self):
+        self.__functions = None
+        self.__segment_program = None
+        self.__disc_program = None
+        self.__edge_buffer = None
+        self.__intensity_buffer = None
+        self.__disc_buffer = None
+        # Graphe du buffer statique
+        self.__roads = None
+        self.__road_count = 0
+        self.__edges = None  # (routes x 2) indices des villes
+        self.__positions = None  # (villes x 2)
+        self.__vertex_count = 0
+
+    def initialize(self, context):
+        """
+        Compile les shaders et crée les buffers dans le contexte courant.
+        Retourne False si le contexte ne le permet pas (le canvas dessine
+        alors avec QPainter).
+        """
+        profile = QOpenGLVersionProfile()
+        profile.setVersion(2, 0)
+        functions = context.versionFunctions(profile)
+        if functions is None or not functions.initializeOpenGLFunctions():
+            return False
+        segment_program = self.__build_program(
+            SEGMENT_VERTEX_SHADER, SEGMENT_FRAGMENT_SHADER
+        )
+        disc_program = self.__build_program(DISC_VERTEX_SHADER, DISC_FRAGMENT_SHADER)
+        if segment_program is None or disc_program is None:
+            return False
+        buffers = []
+        for usage in (
+            QOpenGLBuffer.StaticDraw,
+            QOpenGLBuffer.DynamicDraw,
+            QOpenGLBuffer.DynamicDraw,
+        ):
+            buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+            if not buffer.create():
+                return False
+            buffer.setUsagePattern(usage)
+            buffers.append(buffer)
+        self.__functions = functions
+        self.__segment_program = segment_program
+        self.__disc_program = disc_program
+        self.__edge_buffer, self.__intensity_buffer, self.__disc_buffer = buffers
+        return True
+
+    @staticmethod
+    def __build_program(vertex_source, fragment_source):
+        program = QOpenGLShaderProgram()
+        if not (
+            program.addShaderFromSourceCode(QOpenGLShader.Vertex, vertex_source)
+            and program.addShaderFromSourceCode(QOpenGLShader.Fragment, fragment_source)
+            and program.link()
+        ):
+            print(f"Shader OpenGL invalide : {program.log()}")
+            return None
+        return program
+
+    @staticmethod
+    def __upload(buffer, array):
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        buffer.bind()
+        buffer.allocate(array, array.nbytes)
+        buffer.release()
+
+    def set_graph(self, cities, roads, node_positions):
+        """
+        Met à jour le buffer statique si les routes ou les positions des
+        villes ont changé depuis le dernier appel.
+        """
+        if roads is not self.__roads or len(roads) != self.__road_count:
+            index = {city: i for i, city in enumerate(cities)}
+            self.__edges = np.array(
+                [
+                    (index[road.get_cities()[0]], index[road.get_cities()[1]])
+                    for road in roads
+                ],
+                dtype=int,
+            ).reshape(-1, 2)
+            self.__roads = roads
+            self.__road_count = len(roads)
+            self.__positions = None
+        positions = np.array(
+            [(node_positions[city].x(), node_positions[city].y()) for city in cities],
+            dtype=np.float32,
+        ).reshape(-1, 2)
+        if self.__positions is not None and np.array_equal(positions, self.__positions):
+            return
+        self.__positions = positions
+        vertices = segment_vertices(
+            positions[self.__edges[:, 0]], positions[self.__edges[:, 1]], 2, 8
+        )
+        self.__vertex_count = len(vertices)
+        self.__upload(self.__edge_buffer, vertices)
+
+    def __bind_attributes(self, program, buffer, layout, stride):
+        buffer.bind()
+        offset = 0
+        for name, size in layout:
+            location = program.attributeLocation(name)
+            program.enableAttributeArray(location)
+            program.setAttributeBuffer(location, GL_FLOAT, offset, size, stride)
+            offset += size * 4
+        buffer.release()
+
+    @staticmethod
+    def __release_attributes(program, names):
+        for name in names:
+            program.disableAttributeArray(program.attributeLocation(name))
+
+    @staticmethod
+    def __set_view(program, width, height, origin):
+        program.setUniformValue("u_viewport", float(width), float(height))
+        program.setUniformValue("u_origin", float(origin[0]), float(origin[1]))
+
+    def draw_roads(self, width: int, height: int, origin, intensities):
+        """
+        Dessine toutes les routes, intensities étant le rapport phéromone /
+        phéromone maximale de chaque route (ordre de set_graph).
+        """
+        if self.__vertex_count == 0:
+            return
+        per_vertex = np.repeat(np.asarray(intensities, dtype=np.float32), 6)
+        self.__upload(self.__intensity_buffer, per_vertex)
+        self.__draw_segments(width, height, origin, 0, self.__vertex_count)
+
+    def __draw_segments(self, width, height, origin, first, count):
+        """Dessine count sommets du buffer statique des routes à partir de first."""
+        names = ("a_start", "a_end", "a_corner", "a_width", "a_intensity")
+        program = self.__segment_program
+        program.bind()
+        self.__set_view(program, width, height, origin)
+        program.setUniformValue("u_low", *LOW_COLOR)
+        program.setUniformValue("u_high", *HIGH_COLOR)
+        self.__bind_attributes(
+            program,
+            self.__edge_buffer,
+            [("a_start", 2), ("a_end", 2), ("a_corner", 2), ("a_width", 2)],
+            8 * 4,
+        )
+        self.__bind_attributes(
+            program, self.__intensity_buffer, [("a_intensity", 1)], 4
+        )
+        self.__functions.glDrawArrays(GL_TRIANGLES, first, count)
+        self.__release_attributes(program, names)
+        program.release()
+
+    def draw_discs(
+        self, width: int, height: int, origin, centers, radius: float, colors
+    ):
+        """Dessine des disques (les fourmis) : centres (k x 2), couleurs rgba."""
+        if len(centers) == 0:
+            return
+        vertices = disc_vertices(centers, radius, colors)
+        self.__upload(self.__disc_buffer, vertices)
+        self.__draw_triangles(self.__disc_buffer, width, height, origin, len(vertices))
+
+    def draw_squares(
+        self, width: int, height: int, origin, centers, half_size: float, colors
+    ):
+        """Dessine des carrés pleins (la carte de densité des fourmis)."""
+        if len(centers) == 0:
+            return
+        vertices = disc_vertices(centers, half_size, colors)
+        vertices[:, 2:4] = 0  # coin local nul : pas de découpe en disque
+        self.__upload(self.__disc_buffer, vertices)
+        self.__draw_triangles(self.__disc_buffer, width, height, origin, len(vertices))
+
+    def __draw_triangles(self, buffer, width, height, origin, count):
+        """Dessine count sommets de buffer avec le programme des disques."""
+        functions = self.__functions
+        functions.glEnable(GL_BLEND)
+        functions.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        program = self.__disc_program
+        program.bind()
+        self.__set_view(program, width, height, origin)
+        self.__bind_attributes(
+            program,
+            buffer,
+            [("a_position", 2), ("a_local", 2), ("a_color", 4)],
+            8 * 4,
+        )
+        functions.glDrawArrays(GL_TRIANGLES, 0, count)
+        self.__release_attributes(program, ("a_position", "a_local", "a_color"))
+        program.release()
@@ -0,0 +1,137 @@
+import math
+import time
+
+from PyQt5.QtCore import QPointF, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetricsF, QPen, QStaticText, QTransform
+
+
+def make_static_text(text: str):
+    static_text = QStaticText(text)
+    static_text.setTextFormat(Qt.PlainText)
+    static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+    return static_text
+
+
+class LabelCache:
+    """
+    Textes du canvas mis en page une fois pour toutes : identifiant de
+    chaque ville et étiquette « poids | phéromone » de chaque route, sous
+    forme de QStaticText. La position et l'angle des étiquettes ne sont
+    recalculés que lorsque les routes ou les positions des villes changent ;
+    la partie phéromone n'est rafraîchie qu'au plus toutes les
+    refresh_interval secondes.
+    """
+
+    def __init__(self, refresh_interval: float = 0.25):
+        assert refresh_interval >= 0
+        self.__refresh_interval = refresh_interval
+        self.__pen = QPen(QColor(255, 255, 255))
+        self.__city_font = QFont("Roboto", 16)
+        self.__city_metrics = QFontMetricsF(self.__city_font)
+        self.__road_font = QFont("Roboto", 14)
+        self.__road_metrics = QFontMetricsF(self.__road_font)
+        self.__city_texts = {}  # identifiant -> (QStaticText, décalage du centre)
+        # Étiquettes des routes, dans l'ordre de get_roads()
+        self.__roads = None
+        self.__road_count = 0
+        self.__positions = None  # positions des villes de la dernière mise en page
+        self.__base = None  # transformation du QPainter de la dernière mise en page
+        self.__transforms = []  # position et angle de chaque étiquette
+        self.__weights = []  # partie « poids | » de chaque étiquette
+        self.__road_texts = []  # (texte, QStaticText, point de départ)
+        self.__last_refresh = None
+
+    def draw_city_ids(self, painter, node_positions):
+        """Identifiant de chaque ville, centré sur sa position."""
+        painter.setFont(self.__city_font)
+        painter.setPen(self.__pen)
+        for city, pos in node_positions.items():
+            city_id = city.get_id()
+            if city_id not in self.__city_texts:
+                static_text = make_static_text(str(city_id))
+                static_text.prepare(QTransform(), self.__city_font)
+                size = static_text.size()
+                self.__city_texts[city_id] = (
+                    static_text,
+                    QPointF(size.width() / 2, size.height() / 2),
+                )
+            static_text, center = self.__city_texts[city_id]
+            painter.drawStaticText(pos - center, static_text)
+
+    def __layout_roads(self, roads, node_positions, base):
+        """Position (milieu décalé de 25 px) et angle lisible de chaque étiquette."""
+        self.__roads = roads
+        self.__road_count = len(roads)
+        self.__base = base
+        self.__transforms = []
+        self.__weights = []
+        for road in roads:
+            start_city, end_city = road.get_cities()
+            start = node_positions[start_city]
+            end = node_positions[end_city]
+            dx = end.x() - start.x()
+            dy = end.y() - start.y()
+            mag = math.hypot(dx, dy)
+            offset_x, offset_y = (-dy / mag * 25, dx / mag * 25) if mag else (0, 0)
+            angle_deg = math.degrees(math.atan2(dy, dx))
+            if angle_deg > 90 or angle_deg < -90:
+                angle_deg += 180
+            transform = QTransform()
+            transform.translate(
+                (start.x() + end.x()) / 2 + offset_x,
+                (start.y() + end.y()) / 2 + offset_y,
+            )
+            transform.rotate(angle_deg)
+            self.__transforms.append(transform * base)
+            self.__weights.append(str(round(road.get_weight(), 2)) + " | ")
+        self.__road_texts = [None] * len(roads)
+        self.__last_refresh = None
+
+    def __refresh_road_texts(self, pheromones):
+        """Recrée les QStaticText dont le texte a changé."""
+        ascent = self.__road_metrics.ascent()
+        height = self.__road_metrics.height()
+        for i, (weight, pheromone) in enumerate(zip(self.__weights, pheromones)):
+            text = weight + str(round(pheromone, 3))
+            if self.__road_texts[i] is not None and self.__road_texts[i][0] == text:
+                continue
+            static_text = make_static_text(text)
+            static_text.prepare(self.__transforms[i], self.__road_font)
+            width = self.__road_metrics.horizontalAdvance(text)
+            # Même ligne de base que drawText(-largeur / 2, hauteur / 2)
+            origin = QPointF(-width / 2, height / 2 - ascent)
+            self.__road_texts[i] = (text, static_text, origin)
+
+    def draw_road_labels(self, painter, roads, pheromones, node_positions):
+        """Étiquette « poids | phéromone » de chaque route."""
+        base = painter.worldTransform()
+        positions = [
+            (node_positions[city].x(), node_positions[city].y())
+            for city in node_positions
+        ]
+        if (
+            roads is not self.__roads
+            or len(roads) != self.__road_count
+            or positions != self.__positions
+            or base != self.__base
+        ):
+            self.__positions = positions
+            self.__layout_roads(roads, node_positions, base)
+
+        now = time.perf_counter()
+        if (
+            self.__last_refresh is None
+            or now - self.__last_refresh >= self.__refresh_interval
+        ):
+            self.__refresh_road_texts(pheromones)
+            self.__last_refresh = now
+
+        painter.save()
+        painter.setFont(self.__road_font)
+        painter.setPen(self.__pen)
+        for transform, (_, static_text, origin) in zip(
+            self.__transforms, self.__road_texts
+        ):
+            painter.setWorldTransform(transform)
+            painter.drawStaticText(origin, static_text)
+        painter.restore()
@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def tour_length(tour, D):
+    """Longueur d'un circuit fermé (indices, premier = dernier) dans D."""
+    tour = np.asarray(tour)
+    return D[tour[:-1], tour[1:]].sum()
+
+
+def two_opt(tour, D, max_passes: int = None):
+    """
+    Améliore un circuit fermé par 2-opt. Pour chaque arête (a, b), le gain de
+    tous les échanges avec les arêtes (c, d) suivantes est évalué d'un coup :
+    D[a, c] + D[b, d] - D[a, b] - D[c, d]. Le meilleur échange améliorant est
+    appliqué (inversion du segment b..c), jusqu'à ce qu'aucun échange
+    n'améliore le circuit ou que max_passes passes aient été faites.
+    Les villes non reliées doivent avoir une distance infinie dans D.
+    """
+    tour = np.array(tour)
+    n = len(tour) - 1
+    if n < 4:
+        return tour
+    passes = 0
+    improved = True
+    while improved and (max_passes is None or passes < max_passes):
+        improved = False
+        passes += 1
+        for i in range(n - 2):
+            a, b = tour[i], tour[i + 1]
+            # L'arête (n - 1, n) touche l'arête (0, 1) par le nid
+            js = np.arange(i + 2, n if i > 0 else n - 1)
+            c, d = tour[js], tour[js + 1]
+            delta = D[a, c] + D[b, d] - D[a, b] - D[c, d]
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                j = js[k]
+                tour[i + 1 : j + 1] = tour[i + 1 : j + 1][::-1]
+                improved = True
+    return tour
@@ -0,0 +1,39 @@
+import random
+
+from PyQt5.QtGui import QColor
+
+
+class AntPalette:
+    """
+    Couleurs d'affichage des fourmis, gérées côté visualiseur pour que le
+    moteur (Ant, Civilization) reste sans dépendance à Qt. Les couleurs par
+    défaut ne sont créées qu'au premier affichage de chaque fourmi.
+    """
+
+    def __init__(self):
+        self.__colors = {}  # fourmi -> (couleur sans nourriture, avec nourriture)
+        self.__personalised_colors = {}
+
+    def __default_colors(self, ant):
+        if ant not in self.__colors:
+            self.__colors[ant] = (
+                QColor(100, random.randint(240, 255), 100),
+                QColor(random.randint(150, 230), random.randint(90, 120), 10),
+            )
+        return self.__colors[ant]
+
+    def get_color(self, ant):
+        color_no_food, color_with_food = self.__default_colors(ant)
+        personalised_color = self.__personalised_colors.get(ant)
+        if ant.has_food():
+            return color_with_food
+        elif personalised_color is not None:
+            return personalised_color
+        else:
+            return color_no_food
+
+    def get_personalised_color(self, ant):
+        return self.__personalised_colors.get(ant)
+
+    def set_color(self, ant, color):
+        self.__personalised_colors[ant] = color
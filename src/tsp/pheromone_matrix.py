@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class PheromoneMatrix:
+    """
+    Stockage dense des phéromones et des poids sous forme de matrices (n x n)
+    indexées par les identifiants des villes. Les routes étant non orientées,
+    chaque écriture est répercutée sur (i, j) et (j, i).
+    """
+
+    def __init__(self, capacity: int = 16):
+        self.__index = {}  # id de ville -> ligne de la matrice
+        self.__ids = np.zeros(0, dtype=int)  # ligne -> id de ville
+        # Lignes des voisines de chaque ville, dans l'ordre de City.get_roads()
+        self.__neighbours = []
+        self.__size = 0
+        # Incrémentée à chaque modification non uniforme des phéromones
+        self.__version = 0
+        self.__pheromone = np.zeros((capacity, capacity))
+        # Poids infini pour les villes non reliées directement
+        self.__weights = np.full((capacity, capacity), np.inf)
+
+    def __grow(self):
+        capacity = 2 * len(self.__pheromone)
+        pheromone = np.zeros((capacity, capacity))
+        weights = np.full((capacity, capacity), np.inf)
+        n = self.__size
+        pheromone[:n, :n] = self.__pheromone[:n, :n]
+        weights[:n, :n] = self.__weights[:n, :n]
+        self.__pheromone = pheromone
+        self.__weights = weights
+
+    def get_version(self):
+        return self.__version
+
+    def get_size(self):
+        return self.__size
+
+    def get_index(self, city):
+        return self.__index[city.get_id()]
+
+    def get_ids(self):
+        """Identifiant de la ville de chaque ligne."""
+        return self.__ids
+
+    def get_neighbours(self, i: int):
+        """Lignes des voisines de la ville i, alignées sur City.get_roads()."""
+        return self.__neighbours[i]
+
+    def add_city(self, city):
+        if city.get_id() in self.__index:
+            return self.__index[city.get_id()]
+        if self.__size == len(self.__pheromone):
+            self.__grow()
+        self.__index[city.get_id()] = self.__size
+        self.__ids = np.append(self.__ids, city.get_id())
+        self.__neighbours.append(np.zeros(0, dtype=int))
+        self.__size += 1
+        return self.__size - 1
+
+    def add_road(self, i: int, j: int, weight: float, pheromone: float):
+        self.__weights[i, j] = self.__weights[j, i] = weight
+        self.__pheromone[i, j] = self.__pheromone[j, i] = pheromone
+        self.__neighbours[i] = np.append(self.__neighbours[i], j)
+        self.__neighbours[j] = np.append(self.__neighbours[j], i)
+        self.__version += 1
+        return
+
+    def get_pheromone(self, i: int, j: int):
+        return self.__pheromone[i, j]
+
+    def set_pheromone(self, i: int, j: int, pheromone: float):
+        self.__pheromone[i, j] = self.__pheromone[j, i] = pheromone
+        self.__version += 1
+        return
+
+    def add_pheromone(self, i: int, j: int, pheromone: float):
+        self.__pheromone[i, j] += pheromone
+        self.__pheromone[j, i] = self.__pheromone[i, j]
+        self.__version += 1
+        return
+
+    def get_pheromone_matrix(self):
+        """Vue (n x n) sur les phéromones, sans copie."""
+        return self.__pheromone[: self.__size, : self.__size]
+
+    def get_weight_matrix(self):
+        """Vue (n x n) sur les poids (np.inf si aucune route)."""
+        return self.__weights[: self.__size, : self.__size]
+
+    def get_edge_mask(self):
+        return np.isfinite(self.get_weight_matrix())
+
+    def deposit(self, rows, columns, amounts):
+        """Dépose amounts sur les arêtes (rows[k], columns[k]) en une passe."""
+        np.add.at(self.__pheromone, (rows, columns), amounts)
+        np.add.at(self.__pheromone, (columns, rows), amounts)
+        self.__version += 1
+        return
+
+    def blend(self, rows, columns, weight: float, target):
+        """
+        Rapproche les arêtes (rows[k], columns[k]) de target :
+        tau <- (1 - weight) * tau + weight * target (mises à jour de l'ACS).
+        Une arête répétée n'est mise à jour qu'une fois.
+        """
+        blended = (1 - weight) * self.__pheromone[rows, columns] + weight * target
+        self.__pheromone[rows, columns] = blended
+        self.__pheromone[columns, rows] = blended
+        self.__version += 1
+        return
+
+    def evaporate(self, rho: float):
+        self.__pheromone[: self.__size, : self.__size] *= 1 - rho
+        return
+
+    def scale(self, factor: float):
+        self.__pheromone[: self.__size, : self.__size] *= factor
+        return
+
+    def clamp(self, lower: float, upper: float):
+        """Borne les phéromones des routes existantes à [lower, upper]."""
+        pheromone = self.get_pheromone_matrix()
+        edges = self.get_edge_mask()
+        pheromone[edges] = np.clip(pheromone[edges], lower, upper)
+        self.__version += 1
+        return
+
+    def reset(self, initial_value: float):
+        """Remet toutes les routes existantes à la valeur initiale."""
+        pheromone = self.get_pheromone_matrix()
+        pheromone[self.get_edge_mask()] = initial_value
+        self.__version += 1
+        return
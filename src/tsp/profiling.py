@@ -0,0 +1,72 @@
+from time import perf_counter
+
+
+class PhaseProfiler:
+    """
+    Statistiques par phase d'un step ou d'une boucle génétique : temps
+    cumulé et nombre de passages par phase, plus des compteurs libres
+    (routes examinées, choix effectués...). Désactivé (profiler None dans la
+    civilisation), le coût se limite à un test par phase.
+
+    Utilisation dans le code instrumenté :
+        start = profiler.clock()
+        ...
+        start = profiler.lap("evaporation", start)
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.__times = {}  # phase -> secondes cumulées
+        self.__calls = {}  # phase -> nombre de passages
+        self.__counters = {}
+
+    @staticmethod
+    def clock():
+        return perf_counter()
+
+    def lap(self, phase: str, start: float):
+        """Ajoute le temps écoulé depuis start à phase ; retourne l'instant."""
+        now = perf_counter()
+        self.__times[phase] = self.__times.get(phase, 0.0) + now - start
+        self.__calls[phase] = self.__calls.get(phase, 0) + 1
+        return now
+
+    def count(self, counter: str, value: int = 1):
+        self.__counters[counter] = self.__counters.get(counter, 0) + value
+
+    def get_time(self, phase: str):
+        return self.__times.get(phase, 0.0)
+
+    def get_calls(self, phase: str):
+        return self.__calls.get(phase, 0)
+
+    def get_counter(self, counter: str):
+        return self.__counters.get(counter, 0)
+
+    def get_phases(self):
+        return list(self.__times)
+
+    def as_dict(self):
+        return {
+            "phases": {
+                phase: {"time": self.__times[phase], "calls": self.__calls[phase]}
+                for phase in self.__times
+            },
+            "counters": dict(self.__counters),
+        }
+
+    def __str__(self):
+        total = sum(self.__times.values()) or 1.0
+        lines = [f"{'phase':<20}{'temps (s)':>12}{'%':>7}{'passages':>11}"]
+        for phase, elapsed in sorted(
+            self.__times.items(), key=lambda item: item[1], reverse=True
+        ):
+            lines.append(
+                f"{phase:<20}{elapsed:>12.4f}{100 * elapsed / total:>7.1f}"
+                f"{self.__calls[phase]:>11}"
+            )
+        for counter, value in self.__counters.items():
+            lines.append(f"{counter:<20}{value:>12}")
+        return "\n".join(lines)
@@ -1,12 +1,25 @@
+import math
+
 from tsp.city import City
+from tsp.evaporation import EvaporationClock
 
 
 class Road:
     def __init__(
-        self, weight: float, start_city: City, end_city: City, initial_pheromone: float
+        self,
+        weight: float,
+        start_city: City,
+        end_city: City,
+        initial_pheromone: float,
+        clock: EvaporationClock = None,
     ):
         self.__weight = weight
         self.__pheromone = initial_pheromone
+        # Évaporation paresseuse : exposant de l'horloge au dernier accès
+        self.__clock = clock
+        self.__stamp = clock.get_exponent() if clock is not None else 0.0
+        # Prévenu de chaque modification non uniforme de la phéromone
+        self.__listener = None
         self.__start_city = start_city
         self.__end_city = end_city
 
@@ -16,11 +29,35 @@ class Road:
     def get_weight(self):
         return self.__weight
 
+    def __apply_evaporation(self):
+        # Applique d'un coup la décroissance accumulée depuis le dernier accès
+        if self.__clock is None:
+            return
+        exponent = self.__clock.get_exponent()
+        if exponent != self.__stamp:
+            self.__pheromone *= math.exp(exponent - self.__stamp)
+            self.__stamp = exponent
+
+    def set_listener(self, listener):
+        """listener(road) est appelé après chaque dépôt ou affectation."""
+        self.__listener = listener
+
+    def __notify(self):
+        if self.__listener is not None:
+            self.__listener(self)
+
+    def __touch(self):
+        if self.__clock is not None:
+            self.__stamp = self.__clock.get_exponent()
+
     def get_pheromone(self):
+        self.__apply_evaporation()
         return self.__pheromone
 
     def add_pheromone(self, pheromone: float):
+        self.__apply_evaporation()
         self.__pheromone += pheromone
+        self.__notify()
         return
 
     def get_cities(self):
@@ -28,14 +65,62 @@ class Road:
 
     def set_pheromone(self, pheromone: float):
         self.__pheromone = pheromone
+        self.__touch()
+        self.__notify()
 
     def reset_pheromone(self, initial_value):
         self.__pheromone = initial_value
+        self.__touch()
+        self.__notify()
 
-    def evaporate_pheromone(self):
-        rho = 0.05
+    def evaporate_pheromone(self, rho: float):
+        """Évaporation immédiate de cette seule route."""
+        self.__apply_evaporation()
         self.__pheromone *= 1 - rho
+        self.__notify()
         return
 
     def __str__(self):
-        return f"Road ({self.__start_city.get_id()}, {self.__end_city.get_id()}):\n\tWeight: {self.__weight}\n\tPheromone: {self.__pheromone}"
+        return f"Road ({self.__start_city.get_id()}, {self.__end_city.get_id()}):\n\tWeight: {self.__weight}\n\tPheromone: {self.get_pheromone()}"
+
+
+class MatrixRoad(Road):
+    """
+    Route dont la phéromone est stockée dans une PheromoneMatrix partagée.
+    Elle garde l'interface de Road pour le visualiseur.
+    """
+
+    def __init__(
+        self,
+        weight: float,
+        start_city: City,
+        end_city: City,
+        initial_pheromone: float,
+        store,
+    ):
+        super().__init__(weight, start_city, end_city, initial_pheromone)
+        self.__store = store
+        self.__i = store.get_index(start_city)
+        self.__j = store.get_index(end_city)
+        store.add_road(self.__i, self.__j, weight, initial_pheromone)
+
+    def get_indices(self):
+        return self.__i, self.__j
+
+    def get_pheromone(self):
+        return self.__store.get_pheromone(self.__i, self.__j)
+
+    def add_pheromone(self, pheromone: float):
+        self.__store.add_pheromone(self.__i, self.__j, pheromone)
+        return
+
+    def set_pheromone(self, pheromone: float):
+        self.__store.set_pheromone(self.__i, self.__j, pheromone)
+
+    def reset_pheromone(self, initial_value):
+        self.__store.set_pheromone(self.__i, self.__j, initial_value)
+
+    def evaporate_pheromone(self, rho: float):
+        pheromone = self.__store.get_pheromone(self.__i, self.__j)
+        self.__store.set_pheromone(self.__i, self.__j, pheromone * (1 - rho))
+        return
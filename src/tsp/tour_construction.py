@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class ColonyTourBuilder:
+    """
+    Construit en parallèle les circuits de toute la colonie à partir d'une
+    PheromoneMatrix : chaque étape de construction fait avancer toutes les
+    fourmis d'une ville en une seule passe numpy.
+    """
+
+    def __init__(
+        self, store, alphas, betas, q0, rng=None, candidates=None, local_update=None
+    ):
+        self.__store = store
+        self.__alphas = np.asarray(alphas, dtype=float)[:, None]
+        self.__betas = np.asarray(betas, dtype=float)[:, None]
+        # q0 peut être un scalaire ou un vecteur (une valeur par fourmi)
+        self.__q0 = np.broadcast_to(np.asarray(q0, dtype=float), len(self.__alphas))
+        self.__rng = rng if rng is not None else np.random
+        # Listes de candidates (villes x k), complétées par -1
+        self.__candidates = candidates
+        # Mise à jour locale de l'ACS : (xi, tau0) ou None
+        self.__local_update = local_update
+
+    def __choose_among(self, ants, current, visited, columns):
+        """
+        Choisit pour chaque fourmi une colonne parmi columns (fourmis x c),
+        les colonnes négatives étant ignorées. columns=None désigne toutes
+        les villes.
+        """
+        m = len(ants)
+        if columns is None:
+            pheromone = self.__store.get_pheromone_matrix()[current]
+            weights = self.__store.get_weight_matrix()[current]
+            allowed = ~visited[ants] & np.isfinite(weights)
+        else:
+            rows = current[:, None]
+            safe_columns = np.maximum(columns, 0)
+            pheromone = self.__store.get_pheromone_matrix()[rows, safe_columns]
+            weights = self.__store.get_weight_matrix()[rows, safe_columns]
+            allowed = (
+                (columns >= 0)
+                & ~visited[ants[:, None], safe_columns]
+                & np.isfinite(weights)
+            )
+        stuck = ~allowed.any(axis=1)
+        alphas = self.__alphas[ants]
+        betas = self.__betas[ants]
+
+        with np.errstate(divide="ignore"):
+            eta = np.where(allowed, 1 / weights, 0.0)
+        eta_beta = eta**betas
+        attractiveness = np.where(allowed, pheromone**alphas * eta_beta, 0.0)
+
+        # Exploitation : route de poids maximal (tau * eta^beta)
+        greedy = np.argmax(np.where(allowed, pheromone * eta_beta, -1.0), axis=1)
+
+        # Exploration : roulette vectorisée sur les probabilités cumulées
+        cumulated = np.cumsum(attractiveness, axis=1)
+        total = cumulated[:, -1]
+        draw = self.__rng.random(m) * total
+        roulette = np.argmax(cumulated > draw[:, None], axis=1)
+
+        # Poids tous nuls : tirage uniforme parmi les villes autorisées
+        uniform = total == 0
+        if uniform.any():
+            scores = self.__rng.random(allowed[uniform].shape) * allowed[uniform]
+            roulette[uniform] = np.argmax(scores, axis=1)
+
+        exploit = (self.__rng.random(m) <= self.__q0[ants]) & ~uniform
+        picked = np.where(exploit, greedy, roulette)
+        if columns is None:
+            return picked, stuck
+        return safe_columns[np.arange(m), picked], stuck
+
+    def choose(self, current, visited):
+        """
+        Choisit la prochaine ville de chaque fourmi.
+        current : (fourmis,) indices des villes courantes
+        visited : (fourmis x villes) masque des villes déjà visitées
+        Retourne les indices choisis et un masque des fourmis bloquées.
+        Avec des listes de candidates, le choix se restreint aux k plus
+        proches voisines ; seules les fourmis qui les ont toutes visitées
+        retombent sur l'ensemble des villes.
+        """
+        ants = np.arange(len(current))
+        if self.__candidates is None:
+            return self.__choose_among(ants, current, visited, None)
+
+        choice, stuck = self.__choose_among(
+            ants, current, visited, self.__candidates[current]
+        )
+        if stuck.any():
+            fallback = ants[stuck]
+            choice[fallback], stuck[fallback] = self.__choose_among(
+                fallback, current[fallback], visited, None
+            )
+        return choice, stuck
+
+    def __apply_local_update(self, current, choice):
+        # Toutes les fourmis avancent en même temps : une arête empruntée par
+        # plusieurs fourmis au même pas n'est décrue qu'une fois
+        xi, tau0 = self.__local_update
+        self.__store.blend(current, choice, xi, tau0)
+
+    def build(self, start: int):
+        """
+        Construit un circuit complet par fourmi depuis la ville start.
+        Retourne (tours, lengths, valid) : tours est un tableau
+        (fourmis x (villes + 1)), lengths la longueur de chaque circuit et
+        valid indique les fourmis qui ont pu fermer leur circuit.
+        """
+        m = len(self.__alphas)
+        n = self.__store.get_size()
+        weights = self.__store.get_weight_matrix()
+        ants = np.arange(m)
+
+        tours = np.full((m, n + 1), start, dtype=int)
+        lengths = np.zeros(m)
+        valid = np.ones(m, dtype=bool)
+        visited = np.zeros((m, n), dtype=bool)
+        visited[:, start] = True
+        current = np.full(m, start, dtype=int)
+
+        for k in range(1, n):
+            choice, stuck = self.choose(current, visited)
+            valid &= ~stuck
+            choice = np.where(valid, choice, current)
+            lengths += np.where(valid, weights[current, choice], 0.0)
+            visited[ants, choice] = True
+            tours[:, k] = choice
+            if self.__local_update is not None:
+                self.__apply_local_update(current[valid], choice[valid])
+            current = choice
+
+        # Retour au nid
+        closing = weights[current, start]
+        valid &= np.isfinite(closing)
+        if self.__local_update is not None:
+            self.__apply_local_update(current[valid], np.full(valid.sum(), start))
+        lengths = np.where(valid, lengths + closing, np.inf)
+        return tours, lengths, valid
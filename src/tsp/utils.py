@@ -1,17 +1,21 @@
 import random
-import sys
-
-from PyQt5.QtCore import QPointF
-from PyQt5.QtGui import QSurfaceFormat
-from PyQt5.QtWidgets import QApplication
 
 from tsp.city import City
-from tsp.civilization import Civilization
-from tsp.visualizer import Visualizer
+from tsp.civilization import Civilization, recommended_backend
+
 
-fmt = QSurfaceFormat()
-fmt.setSamples(8)
-QSurfaceFormat.setDefaultFormat(fmt)
+def connect_missing_roads(civ: Civilization, cities, weight: float):
+    """
+    Relie par une route de poids weight chaque paire de villes sans route. Le
+    TSP en mode step suppose un graphe complet : une fourmi doit toujours
+    pouvoir rejoindre une ville non visitée, puis revenir au nid. Avec un
+    poids supérieur à celui des routes du plan, ces routes ne servent qu'en
+    dernier recours.
+    """
+    for i, start_city in enumerate(cities):
+        for end_city in cities[i + 1 :]:
+            if civ.get_road_by_cities(start_city, end_city) is None:
+                civ.add_road(weight, start_city, end_city)
 
 
 def get_small_civ_tsp():
@@ -21,13 +25,14 @@ def get_small_civ_tsp():
 
     civ = Civilization(cities[0], 0.05, 0.1, 0.1, 30)
 
-    for i in range(1, nb_cities - 1):
+    for i in range(1, nb_cities):
         civ.add_city(cities[i])
 
     civ.add_road(1.0, cities[0], cities[1])
     civ.add_road(2.0, cities[1], cities[2])
     civ.add_road(3.0, cities[1], cities[3])
     civ.add_road(4.0, cities[2], cities[3])
+    connect_missing_roads(civ, cities, 5.0)
 
     for i in range(50):
         civ.create_ant_colony(1, random.uniform(0, 5), random.uniform(0, 5))
@@ -42,7 +47,7 @@ def get_big_civ_tsp():
 
     civ = Civilization(cities[0], 0.05, 0.1, 0.1, 50)
 
-    for i in range(1, nb_cities - 1):
+    for i in range(1, nb_cities):
         civ.add_city(cities[i])
 
     civ.add_road(5.0, cities[0], cities[1])
@@ -64,6 +69,7 @@ def get_big_civ_tsp():
     civ.add_road(5.0, cities[4], cities[9])
     civ.add_road(4.0, cities[1], cities[6])
     civ.add_road(5.0, cities[2], cities[8])
+    connect_missing_roads(civ, cities, 10.0)
 
     for i in range(50):
         civ.create_ant_colony(1, random.uniform(0, 5), random.uniform(0, 5))
@@ -76,7 +82,7 @@ def get_really_big_civ_tsp():
 
     civ = Civilization(cities[0], 0.05, 0.1, 0.1, 200)
 
-    for i in range(1, nb_cities - 1):
+    for i in range(1, nb_cities):
         civ.add_city(cities[i])
 
     civ.add_road(5.0, cities[0], cities[1])
@@ -117,17 +123,20 @@ def get_really_big_civ_tsp():
     civ.add_road(4.5, cities[9], cities[14])
     civ.add_road(5.0, cities[8], cities[16])
     civ.add_road(6.0, cities[3], cities[10])
+    connect_missing_roads(civ, cities, 10.0)
 
     for i in range(80):
         civ.create_ant_colony(1, random.uniform(0, 5), random.uniform(0, 5))
     return civ
 
 
-def create_full_city_tsp(n: int) -> Civilization:
+def create_full_city_tsp(n: int, backend: str = None) -> Civilization:
     nb_cities = n
+    if backend is None:
+        backend = recommended_backend(n)
     cities = [City(i) for i in range(nb_cities)]
 
-    civ = Civilization(cities[0], 0.05, 0.1, 0.1, 100)
+    civ = Civilization(cities[0], 0.05, 0.1, 0.1, 100, backend)
     for i in range(1, n):
         civ.add_city(cities[i])
 
@@ -157,14 +166,10 @@ def create_small_full_city_tsp() -> Civilization:
 
 
 def get_empty_civ_tsp():
+    # Seul le mode édition a besoin de positions Qt : import local pour que
+    # les fixtures restent utilisables sans charger Qt
+    from PyQt5.QtCore import QPointF
+
     nest = City(0, QPointF(500, 400))
     civ = Civilization(nest, 0.05, 0.1, 0.1, 100)
     return civ
-
-
-def main_tsp(civ: Civilization, edition_mode):
-    app = QApplication(sys.argv)
-    window = Visualizer(civ, edition_mode)
-    window.showMaximized()
-
-    sys.exit(app.exec_())
@@ -0,0 +1,67 @@
+import random
+
+import numpy as np
+import pytest
+
+from tsp.utils import create_full_city_tsp
+
+
+def seeded_civ(n: int, backend: str, seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+    return create_full_city_tsp(n, backend)
+
+
+def pheromones(civ):
+    return np.array([road.get_pheromone() for road in civ.get_roads()])
+
+
+@pytest.mark.parametrize("backend", ["objects", "matrix"])
+@pytest.mark.parametrize("mode", ["iteration", "global"])
+def test_mmas_pheromones_stay_within_bounds(backend, mode):
+    civ = seeded_civ(12, backend, 1)
+    civ.set_mmas(mode)
+    rng = np.random.default_rng(0)
+    for _ in range(60):
+        civ.iteration(rng)
+        tau_min, tau_max = civ.get_mmas_bounds()
+        values = pheromones(civ)
+        assert values.min() >= tau_min * (1 - 1e-12)
+        assert values.max() <= tau_max * (1 + 1e-12)
+
+
+def test_mmas_reinitialises_on_stagnation():
+    civ = seeded_civ(8, "matrix", 2)
+    civ.set_mmas("iteration", stagnation=1)
+    rng = np.random.default_rng(0)
+    civ.iteration(rng)
+    # Avec stagnation=1, une itération sans amélioration remet tout à tau_max
+    for _ in range(20):
+        best_length = civ.get_best_tour_length()
+        civ.iteration(rng)
+        if civ.get_best_tour_length() == best_length:
+            break
+    else:
+        pytest.fail("toutes les itérations ont amélioré le meilleur circuit")
+    assert np.allclose(pheromones(civ), civ.get_mmas_bounds()[1])
+
+
+@pytest.mark.parametrize("mode", [None, "iteration"])
+def test_backends_agree_for_a_fixed_seed(mode):
+    results = []
+    for backend in ("objects", "matrix"):
+        civ = seeded_civ(9, backend, 7)
+        civ.set_mmas(mode)
+        for _ in range(150):
+            civ.step()
+        results.append(
+            (
+                pheromones(civ),
+                [ant.get_food_quantity() for ant in civ.get_ants()],
+                civ.get_best_tour_length(),
+            )
+        )
+    objects, matrix = results
+    assert np.allclose(objects[0], matrix[0], rtol=1e-9)
+    assert objects[1] == matrix[1]
+    assert objects[2] == matrix[2]
@@ -0,0 +1,33 @@
+import numpy as np
+
+from tsp.local_search import tour_length, two_opt
+
+
+def random_instance(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, size=(n, 2))
+    D = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    tour = np.concatenate(([0], rng.permutation(np.arange(1, n)), [0]))
+    return D, tour
+
+
+def test_two_opt_returns_a_shorter_permutation():
+    for seed in range(5):
+        D, tour = random_instance(15, seed)
+        improved = two_opt(tour, D)
+        assert improved[0] == improved[-1] == 0
+        assert sorted(improved[:-1]) == list(range(15))
+        assert tour_length(improved, D) <= tour_length(tour, D) + 1e-9
+
+
+def test_two_opt_removes_a_crossing():
+    # Carré parcouru en croisant ses diagonales
+    points = np.array([(0, 0), (1, 0), (0, 1), (1, 1)], dtype=float)
+    D = np.linalg.norm(points[:, None] - points[None, :], axis=-1)
+    improved = two_opt([0, 1, 2, 3, 0], D)
+    assert np.isclose(tour_length(improved, D), 4.0)
+
+
+def test_two_opt_keeps_short_tours():
+    D = np.ones((3, 3))
+    assert list(two_opt([0, 1, 2, 0], D)) == [0, 1, 2, 0]